@@ -0,0 +1,102 @@
+import os
+import hashlib
+from ini_document_module import atomic_write_lines
+
+ASSET_CACHE_DIR = os.path.join("launcher_cache", "assets")
+ASSET_FILE_EXTENSION = ".ppm"
+# Transparent pixels are composited onto the color shown behind the images (the black window background)
+ASSET_BACKGROUND = (0, 0, 0)
+
+# Source content hashes already computed in this session: absolute path -> ((mtime_ns, size), sha1)
+_source_digest_cache = {}
+# Scaled images already loaded in this session: cache file path -> PIL image
+_asset_memory_cache = {}
+
+def source_digest(path):
+    """ SHA-1 of the file's content, recomputed only when its mtime/size change """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _source_digest_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    _source_digest_cache[path] = (signature, digest)
+    return digest
+
+class AssetCache:
+    """ Persistent cache of images already scaled to the size they are displayed at.
+
+    Entries are keyed by the source's file name, content hash and target size, and stored as binary
+    PPM, which Tk's PhotoImage loads natively (no PIL decode, no resample) and PIL reads without
+    inflating. Storing an entry deletes the older ones of the same file name and size, so replacing
+    an image does not leave its previous scaled copies behind.
+
+    PPM has no alpha channel: transparent pixels are composited onto ASSET_BACKGROUND. """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def key(self, source_path, size):
+        # The file name rather than the full path: a one-file build unpacks to a new folder every run
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        return f"{stem}_{source_digest(source_path)}_{size[0]}x{size[1]}"
+
+    def scaled_path(self, source_path, size):
+        """ Path of the cached copy of source_path scaled to size, creating it on a cache miss.
+        Returns None if the cache cannot be written (read-only install): get() then returns the
+        image already scaled in memory. """
+        cached_path = os.path.join(self.cache_dir, self.key(source_path, size) + ASSET_FILE_EXTENSION)
+        if os.path.isfile(cached_path):
+            return cached_path
+        image = self.render(source_path, size)
+        try:
+            self.store(cached_path, image)
+        except OSError as e:
+            print(f"Could not cache scaled image {cached_path}: {e}")
+            _asset_memory_cache[cached_path] = image
+            return None
+        return cached_path
+
+    def get(self, source_path, size):
+        """ PIL image of source_path scaled to size, decoded at most once per session """
+        from PIL import Image
+        cached_path = os.path.join(self.cache_dir, self.key(source_path, size) + ASSET_FILE_EXTENSION)
+        if cached_path in _asset_memory_cache:
+            return _asset_memory_cache[cached_path]
+        try:
+            with Image.open(cached_path) as cached:
+                image = cached.copy()
+        except (OSError, ValueError):
+            image = self.render(source_path, size)
+            try:
+                self.store(cached_path, image)
+            except OSError as e:
+                print(f"Could not cache scaled image {cached_path}: {e}")
+        _asset_memory_cache[cached_path] = image
+        return image
+
+    def render(self, source_path, size):
+        from PIL import Image
+        with Image.open(source_path) as source:
+            image = source.convert("RGBA").resize(size, Image.Resampling.LANCZOS)
+        return Image.alpha_composite(Image.new("RGBA", size, ASSET_BACKGROUND + (255,)), image).convert("RGB")
+
+    def store(self, cached_path, image):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        header = f"P6\n{image.width} {image.height}\n255\n".encode("ascii")
+        atomic_write_lines(cached_path, [header, image.tobytes()], mode='wb')
+        self.evict_stale(cached_path)
+
+    def evict_stale(self, cached_path):
+        """ Deletes the entries for the same file name and size as cached_path, other than itself """
+        filename = os.path.basename(cached_path)
+        stem, _, size_part = filename.rsplit('_', 2)  # "<file name>_<sha1>_<W>x<H>.ppm"
+        for entry in os.listdir(self.cache_dir):
+            parts = entry.rsplit('_', 2)
+            if entry != filename and len(parts) == 3 and parts[0] == stem and parts[2] == size_part:
+                try:
+                    os.remove(os.path.join(self.cache_dir, entry))
+                except OSError:
+                    pass
@@ -0,0 +1,246 @@
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import statistics
+import tempfile
+from ini_document_module import invalidate_ini_document
+from worlds_install_module import WorldsInstall, INI_FILE_NAME, OVERRIDE_FILE_NAME, EXECUTABLE_NAME, SERVER_CONFIG_FILE
+from theme_engine_module import ThemeApplyEngine
+from cache_module import CacheCleaner, EvictionPolicy, CACHE_DIR_NAME
+
+BENCH_FORMAT_VERSION = 1
+BENCH_REPEAT = 5
+# A median more than this much slower than the baseline's is reported as a regression
+BENCH_TOLERANCE = 0.25
+BENCH_SEED = 1234
+
+class BenchParams:
+    """ Size of the synthetic install; scale multiplies every count """
+
+    def __init__(self, scale=1.0):
+        self.ini_lines = int(10000 * scale)
+        self.server_sections = int(500 * scale)
+        self.cache_files = int(20000 * scale)
+        self.cache_dirs = max(1, int(200 * scale))
+        self.themes = max(2, int(300 * scale))
+        self.theme_files = 60
+
+    def to_dict(self):
+        return dict(vars(self))
+
+# --- Synthetic install ---
+def server_name(i):
+    return f"Server{i:05d}"
+
+def server_address(i):
+    return f"[host{i}.example.net:{6000 + i % 1000}]"
+
+def build_install(root, params, rng):
+    """ worlds.ini with params.server_sections [host:port] sections padded to params.ini_lines lines,
+    override.ini, an old-client run.exe and a server list naming every section """
+    os.makedirs(root, exist_ok=True)
+    lines = ["[Gamma]\n", "multirun=0\n", "classicchatbox=1\n", "avatars=16\n", "upgradeServer=http://upgrade.example.net/3DCDup\n", "\n",
+             "[InstalledWorlds]\n", "; worlds installed by the client\n", "\n"]
+    for i in range(params.server_sections):
+        lines += [server_address(i) + "\n", f"lastvisit={rng.randrange(10 ** 9)}\n", "\n"]
+    filler = 0
+    while len(lines) < params.ini_lines:
+        if filler % 50 == 0:
+            lines.append(f"\n[World{filler // 50}]\n")
+        lines.append(f"key{filler}={rng.randrange(10 ** 6)}\n")
+        filler += 1
+    with open(os.path.join(root, INI_FILE_NAME), 'w') as f:
+        f.writelines(lines)
+    with open(os.path.join(root, OVERRIDE_FILE_NAME), 'w') as f:
+        f.write(f"[Runtime]\nWorldServer=worldserver://{server_address(0)[1:-1]}/\nRunMode=1\n")
+    open(os.path.join(root, EXECUTABLE_NAME), 'wb').close()
+    config = {"server_selection": {server_name(i): {"address": server_address(i), "world_server": f"WorldServer=worldserver://{server_address(i)[1:-1]}/"}
+                                   for i in range(params.server_sections)},
+              "updating_server": {"Nothing": {}, "Remove": {},
+                                  "Example": {"upgrade_server": "upgradeServer=http://upgrade.example.net/3DCDup", "script_server": "scriptServer=http://script.example.net"}}}
+    with open(os.path.join(root, SERVER_CONFIG_FILE), 'w') as f:
+        json.dump(config, f)
+    return config
+
+def build_cache(cache_dir, params, rng):
+    """ params.cache_files small files spread over params.cache_dirs nested folders, with spread-out times """
+    now = time.time()
+    directories = [os.path.join(cache_dir, f"world{i % 40}", f"chunk{i}") for i in range(params.cache_dirs)]
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+    for i in range(params.cache_files):
+        path = os.path.join(directories[i % len(directories)], f"asset{i}.cmp")
+        with open(path, 'wb') as f:
+            f.write(b"\0" * rng.randrange(64, 4096))
+        stamp = now - rng.randrange(90 * 86400)
+        os.utime(path, (stamp, stamp))
+
+def build_theme_library(themes_dir, params, rng):
+    """ params.themes theme folders of params.theme_files images each, and the files.txt listing them """
+    filenames = [f"image{i}.gif" for i in range(params.theme_files)]
+    for t in range(params.themes):
+        theme_dir = os.path.join(themes_dir, f"Theme{t:04d}")
+        os.makedirs(theme_dir, exist_ok=True)
+        for filename in filenames:
+            with open(os.path.join(theme_dir, filename), 'wb') as f:
+                f.write(bytes([t % 256]) * rng.randrange(512, 8192))
+    files_list_path = os.path.join(themes_dir, "files.txt")
+    with open(files_list_path, 'w') as f:
+        f.write("\n".join(filenames) + "\n")
+    return files_list_path
+
+# --- Timing ---
+def time_operation(run, setup=None, repeat=BENCH_REPEAT):
+    """ Times run() repeat times, calling setup() untimed before each run. Returns a result dict in ms. """
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started_at = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return {"runs": repeat, "min_ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3),
+            "mean_ms": round(statistics.fmean(samples), 3)}
+
+def operations(work_dir, params, rng):
+    """ (name, run, setup) for every benchmarked operation. These are the UI-free calls behind
+    check_setting_status, toggle_setting_action, PLAY, detect_current_server, the theme selector's
+    Apply and clean_cache, so nothing here needs a display. """
+    install_dir = os.path.join(work_dir, "install")
+    config = build_install(install_dir, params, rng)
+    server_map, updating_map = config["server_selection"], config["updating_server"]
+    install = WorldsInstall(install_dir)
+    themes_dir = os.path.join(work_dir, "themes")
+    files_list_path = build_theme_library(themes_dir, params, rng)
+    cache_dir = os.path.join(install_dir, CACHE_DIR_NAME)
+    servers = [server_name(0), server_name(params.server_sections // 2)]
+    themes = ["Theme0000", "Theme0001"]
+    state = {"server": 0, "theme": 0}
+
+    def cold():
+        # Drops the parsed ini files so the next call reads them from disk again
+        invalidate_ini_document(install.worlds_path)
+        invalidate_ini_document(install.override_path)
+
+    def toggle():
+        transaction = install.transaction()
+        transaction.set("multirun", install.toggled_value("multirun", transaction=transaction))
+        install.commit(transaction)
+
+    def apply_next_server():
+        state["server"] ^= 1
+        install.apply_server_changes(servers[state["server"]], "Example", server_map, updating_map, settings={"avatars": "16"})
+
+    def apply_same_server():
+        install.apply_server_changes(servers[state["server"]], "Example", server_map, updating_map, settings={"avatars": "16"})
+
+    def apply_next_theme():
+        state["theme"] ^= 1
+        ThemeApplyEngine(themes_dir, install_dir, files_list_path).apply(themes[state["theme"]])
+
+    def apply_same_theme():
+        ThemeApplyEngine(themes_dir, install_dir, files_list_path).apply(themes[state["theme"]])
+
+    def fill_cache():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        build_cache(cache_dir, params, rng)
+
+    def check_status():
+        install.setting_status("multirun")
+
+    def detect():
+        install.detect_current_server(server_map)
+
+    def fresh_detect():
+        WorldsInstall(install_dir).detect_current_server(server_map)
+
+    return [
+        ("check_setting_status", check_status, None),
+        ("check_setting_status_cold", check_status, cold),
+        ("toggle_setting_action", toggle, None),
+        ("apply_server_changes", apply_next_server, None),
+        ("apply_server_changes_unchanged", apply_same_server, None),
+        ("detect_current_server", detect, None),
+        ("detect_current_server_cold", fresh_detect, cold),
+        ("theme_apply", apply_next_theme, None),
+        ("theme_apply_unchanged", apply_same_theme, None),
+        ("clean_cache", lambda: CacheCleaner(cache_dir).run(), fill_cache),
+        ("clean_cache_policy", lambda: CacheCleaner(cache_dir, EvictionPolicy(max_age_days=30)).run(), fill_cache),
+    ]
+
+def run_benchmarks(params, repeat=BENCH_REPEAT, only=None, work_dir=None, out=sys.stdout):
+    rng = random.Random(BENCH_SEED)
+    owns_work_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="worlds_bench_")
+    results = {}
+    try:
+        print(f"Building synthetic install in {work_dir}...", file=out, flush=True)
+        for name, run, setup in operations(work_dir, params, rng):
+            if only and name not in only:
+                continue
+            results[name] = time_operation(run, setup, repeat)
+            print(f"{name:<34}{results[name]['median_ms']:>12.3f} ms", file=out, flush=True)
+    finally:
+        if owns_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return {"version": BENCH_FORMAT_VERSION, "python": platform.python_version(), "platform": platform.platform(),
+            "params": params.to_dict(), "repeat": repeat, "results": results}
+
+def compare(report, baseline, tolerance=BENCH_TOLERANCE):
+    """ Lines comparing each median with the baseline's, and whether any regressed beyond tolerance """
+    lines, regressed = [], False
+    if baseline.get("params") != report["params"]:
+        lines.append("Warning: the baseline was measured with different sizes, ratios are not comparable.")
+    for name, result in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous["median_ms"]:
+            lines.append(f"{name:<34}{result['median_ms']:>12.3f} ms    (new)")
+            continue
+        ratio = result["median_ms"] / previous["median_ms"]
+        status = "REGRESSION" if ratio > 1 + tolerance else ("faster" if ratio < 1 - tolerance else "ok")
+        regressed = regressed or status == "REGRESSION"
+        lines.append(f"{name:<34}{result['median_ms']:>12.3f} ms  {previous['median_ms']:>12.3f} ms  x{ratio:5.2f}  {status}")
+    return lines, regressed
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="benchmark_module", description="Time the launcher's file operations on a synthetic install.")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every synthetic size (default 1: 10k-line worlds.ini, 500 servers, 20k cache files, 300 themes)")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help=f"timed runs per operation (default {BENCH_REPEAT})")
+    parser.add_argument("--only", action="append", metavar="NAME", help="run only this operation (repeatable)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=BENCH_TOLERANCE, help=f"slowdown allowed before a regression is reported (default {BENCH_TOLERANCE})")
+    parser.add_argument("--work-dir", help="build the synthetic install here and keep it (default: a temporary folder)")
+    return parser
+
+def main(argv):
+    args = build_parser().parse_args(argv)
+    if args.repeat < 1 or args.scale <= 0:
+        print("--repeat and --scale must be positive.", file=sys.stderr)
+        return 2
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read baseline {args.baseline}: {e}", file=sys.stderr)
+            return 2
+    report = run_benchmarks(BenchParams(args.scale), args.repeat, args.only, args.work_dir)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+    if baseline is None:
+        return 0
+    lines, regressed = compare(report, baseline, args.tolerance)
+    print(f"\n{'operation':<34}{'median':>15}  {'baseline':>15}")
+    print("\n".join(lines))
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
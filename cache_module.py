@@ -0,0 +1,396 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ini_document_module import atomic_write_lines
+from theme_engine_module import file_sha1
+
+CACHE_DIR_NAME = 'cachedir'
+CLEAN_WORKERS = 8
+CLEAN_BATCH_SIZE = 256
+HASH_CACHE_PATH = os.path.join("launcher_cache", "cache_hashes.json")
+REPORT_TOP_N = 20
+
+def format_size(num_bytes):
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def walk_files(root, directories=None, errors=None):
+    """ Streams (path, os.DirEntry) for every file and symlink below root using os.scandir.
+    If a list is given as directories, every subdirectory is appended to it, parents first.
+    A folder that cannot be listed is skipped; if a list is given as errors, (folder, OSError) is appended to it. """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if directories is not None:
+                            directories.append(entry.path)
+                        stack.append(entry.path)
+                    else:
+                        yield entry.path, entry
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            if errors is not None:
+                errors.append((current, e))
+
+class CacheEntry:
+    __slots__ = ("path", "size", "atime", "mtime", "mtime_ns")
+
+    def __init__(self, path, size, atime, mtime, mtime_ns=None):
+        self.path = path
+        self.size = size
+        self.atime = atime
+        self.mtime = mtime
+        self.mtime_ns = mtime_ns
+
+    @property
+    def last_used(self):
+        # Windows and noatime mounts often never update atime, so a newer mtime also counts as use
+        return max(self.atime, self.mtime)
+
+class CacheIndex:
+    """ Flat index of every file in a cache folder with its size and access/modify times """
+
+    def __init__(self, cache_dir, entries=None):
+        self.cache_dir = cache_dir
+        self.entries = entries or []
+
+    @property
+    def total_bytes(self):
+        return sum(entry.size for entry in self.entries)
+
+    @classmethod
+    def scan(cls, cache_dir, cancel_event=None, directories=None, errors=None):
+        index = cls(cache_dir)
+        for path, dir_entry in walk_files(cache_dir, directories, errors):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            try:
+                st = dir_entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            index.entries.append(CacheEntry(path, st.st_size, st.st_atime, st.st_mtime, st.st_mtime_ns))
+        return index
+
+class EvictionPolicy:
+    """ Chooses which cache files to delete: everything unused for longer than max_age_days,
+    then least-recently-used files until the rest fits in max_total_bytes. None disables a limit. """
+
+    def __init__(self, max_total_bytes=None, max_age_days=None):
+        self.max_total_bytes = max_total_bytes
+        self.max_age_days = max_age_days
+
+    def select(self, index, now=None):
+        now = time.time() if now is None else now
+        evict, keep = [], []
+        max_age_seconds = self.max_age_days * 86400 if self.max_age_days is not None else None
+        for entry in index.entries:
+            if max_age_seconds is not None and now - entry.last_used > max_age_seconds:
+                evict.append(entry)
+            else:
+                keep.append(entry)
+        if self.max_total_bytes is not None:
+            remaining = sum(entry.size for entry in keep)
+            if remaining > self.max_total_bytes:
+                keep.sort(key=lambda entry: entry.last_used)
+                for entry in keep:
+                    if remaining <= self.max_total_bytes:
+                        break
+                    evict.append(entry)
+                    remaining -= entry.size
+        return evict
+
+class CacheCleaner:
+    """ Deletes files inside a cache folder from a background thread.
+
+    Without a policy the tree is streamed with os.scandir and everything is deleted. With an
+    EvictionPolicy the folder is indexed first and only the files it selects are deleted.
+    Files are unlinked in batches by a worker pool; files_scanned / files_deleted / bytes_freed /
+    errors ((path, OSError) of files and folders that could not be deleted or listed) are updated
+    live (read them from any thread), cancel() stops after the batches already handed out, and
+    finished is set once the run is over. error is set if the run itself failed. """
+
+    def __init__(self, cache_dir, policy=None, workers=CLEAN_WORKERS, batch_size=CLEAN_BATCH_SIZE):
+        self.cache_dir = cache_dir
+        self.policy = policy
+        self.workers = workers
+        self.batch_size = batch_size
+        self.files_scanned = 0
+        self.files_selected = None
+        self.files_deleted = 0
+        self.bytes_freed = 0
+        self.errors = []
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.finished = threading.Event()
+        self.lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        directories = []
+        # At most two batches per worker are queued, so memory stays flat on huge caches
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                batch = []
+                for path, size in self.files_to_delete(directories):
+                    if self.cancelled:
+                        break
+                    batch.append((path, size))
+                    if len(batch) >= self.batch_size:
+                        self.submit_batch(executor, slots, batch)
+                        batch = []
+                if batch and not self.cancelled:
+                    self.submit_batch(executor, slots, batch)
+            # Children were listed after their parents, so reversed order empties the tree bottom-up
+            for directory in reversed(directories):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    # Not empty: cancelled before its files went, or something failed inside it
+                    pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished.set()
+
+    def files_to_delete(self, directories):
+        """ Yields (path, size) pairs, streaming straight from the walk when no policy is set """
+        if self.policy is None:
+            for path, entry in walk_files(self.cache_dir, directories, self.errors):
+                self.files_scanned += 1
+                try:
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    size = 0
+                yield path, size
+            return
+        index = CacheIndex.scan(self.cache_dir, self.cancel_event, directories, self.errors)
+        self.files_scanned = len(index.entries)
+        selected = self.policy.select(index)
+        self.files_selected = len(selected)
+        for entry in selected:
+            yield entry.path, entry.size
+
+    def submit_batch(self, executor, slots, batch):
+        slots.acquire()
+        future = executor.submit(self.delete_batch, batch)
+        future.add_done_callback(lambda f: slots.release())
+
+    def delete_batch(self, batch):
+        deleted, freed, errors = 0, 0, []
+        for path, size in batch:
+            if self.cancelled:
+                break
+            try:
+                os.unlink(path)
+                deleted += 1
+                freed += size
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                errors.append((path, e))
+        with self.lock:
+            self.files_deleted += deleted
+            self.bytes_freed += freed
+            self.errors.extend(errors)
+
+class CacheReport:
+    """ What fills a cache folder: totals, breakdowns by extension and world, the largest files and
+    groups of byte-identical files (reclaimable_bytes is what hardlinking them would free) """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.total_files = 0
+        self.total_bytes = 0
+        self.by_extension = {}  # extension -> [count, bytes]
+        self.by_world = {}  # top-level folder -> [count, bytes]
+        self.largest = []  # CacheEntry, largest first
+        self.duplicate_groups = []  # lists of paths with identical content, first one is kept
+        self.duplicate_sizes = []  # size of each file in the matching duplicate group
+        self.duplicate_digests = []  # SHA-1 of the matching duplicate group
+        self.signatures = {}  # path of every duplicate -> (size, mtime_ns) when it was hashed
+        self.reclaimable_bytes = 0
+
+    def format(self, top_n=REPORT_TOP_N):
+        lines = [f"{self.total_files} files, {format_size(self.total_bytes)} in {self.cache_dir}", ""]
+        for title, table in (("By world", self.by_world), ("By extension", self.by_extension)):
+            lines.append(f"{title}:")
+            for name, (count, size) in sorted(table.items(), key=lambda item: item[1][1], reverse=True)[:top_n]:
+                lines.append(f"  {format_size(size):>10}  {count:>7} files  {name}")
+            lines.append("")
+        lines.append(f"Largest {min(top_n, len(self.largest))} files:")
+        for entry in self.largest[:top_n]:
+            lines.append(f"  {format_size(entry.size):>10}  {os.path.relpath(entry.path, self.cache_dir)}")
+        lines.append("")
+        lines.append(f"{len(self.duplicate_groups)} groups of duplicate files, {format_size(self.reclaimable_bytes)} reclaimable by hardlinking.")
+        for group, size in list(zip(self.duplicate_groups, self.duplicate_sizes))[:top_n]:
+            lines.append(f"  {len(group)} x {format_size(size)}  {os.path.relpath(group[0], self.cache_dir)}")
+        return "\n".join(lines)
+
+class CacheAnalyzer:
+    """ Builds a CacheReport from a background thread and can replace duplicates with hardlinks.
+
+    Only files that share their size with another file are hashed, and hashes are remembered
+    by size + mtime in a JSON file, so repeat scans only rehash files that changed.
+    stage / done / total describe live progress; report (or error) is set once finished is. """
+
+    def __init__(self, cache_dir, hash_cache_path, top_n=REPORT_TOP_N):
+        self.cache_dir = cache_dir
+        self.hash_cache_path = hash_cache_path
+        self.top_n = top_n
+        self.stage = "Indexing"
+        self.done = 0
+        self.total = 0
+        self.report = None
+        self.error = None
+        self.linked_files = 0
+        self.linked_bytes = 0
+        self.link_errors = []
+        self.changed_files = 0  # duplicates skipped because one of the files changed after the scan
+        self.cancel_event = threading.Event()
+        self.finished = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def start(self, deduplicate=False):
+        self.finished.clear()
+        threading.Thread(target=self.run, args=(deduplicate,), daemon=True).start()
+
+    def run(self, deduplicate=False):
+        try:
+            if self.report is None or not deduplicate:
+                self.report = self.analyze()
+            if deduplicate and not self.cancelled:
+                self.deduplicate(self.report)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished.set()
+
+    def load_hash_cache(self):
+        try:
+            with open(self.hash_cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_hash_cache(self, hashes):
+        os.makedirs(os.path.dirname(self.hash_cache_path), exist_ok=True)
+        atomic_write_lines(self.hash_cache_path, [json.dumps(hashes)])
+
+    def analyze(self):
+        self.stage, self.done, self.total = "Indexing", 0, 0
+        index = CacheIndex.scan(self.cache_dir, self.cancel_event)
+        report = CacheReport(self.cache_dir)
+        by_size = {}
+        for entry in index.entries:
+            relative = os.path.relpath(entry.path, self.cache_dir)
+            world = relative.split(os.sep, 1)[0] if os.sep in relative else "(root)"
+            extension = os.path.splitext(entry.path)[1].lower() or "(none)"
+            for table, key in ((report.by_world, world), (report.by_extension, extension)):
+                totals = table.setdefault(key, [0, 0])
+                totals[0] += 1
+                totals[1] += entry.size
+            report.total_files += 1
+            report.total_bytes += entry.size
+            if entry.size:
+                by_size.setdefault(entry.size, []).append(entry)
+        report.largest = sorted(index.entries, key=lambda entry: entry.size, reverse=True)[:self.top_n]
+
+        # Only same-size files can be duplicates; hardlinks of one file count once
+        candidates = [group for group in by_size.values() if len(group) > 1]
+        self.stage, self.total = "Hashing", sum(len(group) for group in candidates)
+        old_hashes = self.load_hash_cache()
+        hashes, signatures = {}, {}
+        for group in candidates:
+            by_content = {}
+            for entry in group:
+                if self.cancelled:
+                    return report
+                relative = os.path.relpath(entry.path, self.cache_dir)
+                try:
+                    st = os.stat(entry.path)
+                    cached = old_hashes.get(relative)
+                    if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+                        sha1 = cached["sha1"]
+                    else:
+                        sha1 = file_sha1(entry.path)
+                except OSError:
+                    continue
+                finally:
+                    self.done += 1
+                hashes[relative] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": sha1}
+                signatures[entry.path] = (st.st_size, st.st_mtime_ns)
+                inodes = by_content.setdefault(sha1, {})
+                inodes.setdefault((st.st_dev, st.st_ino) if st.st_ino else entry.path, entry.path)
+            for sha1, inodes in by_content.items():
+                if len(inodes) > 1:
+                    report.duplicate_groups.append(sorted(inodes.values()))
+                    report.duplicate_sizes.append(group[0].size)
+                    report.duplicate_digests.append(sha1)
+                    report.signatures.update((path, signatures[path]) for path in inodes.values())
+                    report.reclaimable_bytes += group[0].size * (len(inodes) - 1)
+        order = sorted(range(len(report.duplicate_groups)),
+                       key=lambda i: report.duplicate_sizes[i] * (len(report.duplicate_groups[i]) - 1), reverse=True)
+        report.duplicate_groups = [report.duplicate_groups[i] for i in order]
+        report.duplicate_sizes = [report.duplicate_sizes[i] for i in order]
+        report.duplicate_digests = [report.duplicate_digests[i] for i in order]
+        self.save_hash_cache(hashes)
+        return report
+
+    def unchanged(self, report, path, sha1):
+        """ True if path still has the size, mtime and content it had when report was built """
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns) == report.signatures.get(path) and file_sha1(path) == sha1
+
+    def deduplicate(self, report):
+        """ Replaces every duplicate with a hardlink to the first file of its group. Both files are
+        re-checked just before linking: one the game rewrote since the scan is left alone (counted
+        in changed_files). Linked files share their content, so a later in-place rewrite of one
+        changes all of them. """
+        self.stage, self.done, self.total = "Linking", 0, sum(len(group) - 1 for group in report.duplicate_groups)
+        for group, size, sha1 in zip(report.duplicate_groups, report.duplicate_sizes, report.duplicate_digests):
+            keep = group[0]
+            for duplicate in group[1:]:
+                if self.cancelled:
+                    return
+                temp_path = duplicate + ".dedup-tmp"
+                try:
+                    if not (self.unchanged(report, keep, sha1) and self.unchanged(report, duplicate, sha1)):
+                        self.changed_files += 1
+                        self.done += 1
+                        continue
+                    os.link(keep, temp_path)
+                    os.replace(temp_path, duplicate)
+                    self.linked_files += 1
+                    self.linked_bytes += size
+                except OSError as e:
+                    self.link_errors.append((duplicate, e))
+                    try:
+                        os.unlink(temp_path)
+                    except OSError:
+                        pass
+                self.done += 1
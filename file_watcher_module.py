@@ -0,0 +1,133 @@
+import os
+import sys
+import queue
+import select
+import struct
+import threading
+import time
+
+WATCH_POLL_INTERVAL = 1.0
+WATCH_DEBOUNCE = 0.3
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+def _load_inotify():
+    """ libc's inotify functions, or None where the platform does not have them """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+class FileWatcher:
+    """ Watches a few files from a daemon thread and queues the set of paths that changed.
+
+    inotify watches the files' directories where it is available (so atomic replaces and deletes
+    are seen too); elsewhere each file is stat()ed every poll_interval seconds. Bursts of changes
+    are debounced: a batch is only queued once the files have been quiet for debounce seconds.
+    The Tk thread collects batches with poll(). """
+
+    def __init__(self, paths, poll_interval=WATCH_POLL_INTERVAL, debounce=WATCH_DEBOUNCE):
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.changes = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.backend = None
+
+    def start(self):
+        libc = _load_inotify()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC) if libc else -1
+        if fd >= 0:
+            self.backend = "inotify"
+            target = self.run_inotify
+            args = (libc, fd)
+        else:
+            self.backend = "polling"
+            target = self.run_polling
+            args = ()
+        self.thread = threading.Thread(target=target, args=args, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def poll(self):
+        """ Paths changed since the last call (an empty set if none) """
+        changed = set()
+        while True:
+            try:
+                changed |= self.changes.get_nowait()
+            except queue.Empty:
+                return changed
+
+    def run_inotify(self, libc, fd):
+        try:
+            watches = {}  # watch descriptor -> directory
+            for directory in {os.path.dirname(path) for path in self.paths}:
+                wd = libc.inotify_add_watch(fd, os.fsencode(directory), INOTIFY_MASK)
+                if wd >= 0:
+                    watches[wd] = directory
+            pending, last_event = set(), 0.0
+            while not self.stop_event.is_set():
+                timeout = self.debounce if pending else 0.5
+                readable, _, _ = select.select([fd], [], [], timeout)
+                if readable:
+                    try:
+                        data = os.read(fd, 64 * 1024)
+                    except BlockingIOError:
+                        data = b""
+                    offset = 0
+                    while offset + INOTIFY_EVENT.size <= len(data):
+                        wd, _, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+                        offset += INOTIFY_EVENT.size
+                        name = data[offset:offset + name_length].rstrip(b"\0")
+                        offset += name_length
+                        path = os.path.join(watches.get(wd, ""), os.fsdecode(name))
+                        if path in self.paths:
+                            pending.add(path)
+                            last_event = time.monotonic()
+                if pending and time.monotonic() - last_event >= self.debounce:
+                    self.changes.put(pending)
+                    pending = set()
+        finally:
+            os.close(fd)
+
+    def run_polling(self):
+        signatures = {path: _signature(path) for path in self.paths}
+        pending, last_event = set(), 0.0
+        while not self.stop_event.wait(self.debounce if pending else self.poll_interval):
+            for path in self.paths:
+                signature = _signature(path)
+                if signature != signatures[path]:
+                    signatures[path] = signature
+                    pending.add(path)
+                    last_event = time.monotonic()
+            if pending and time.monotonic() - last_event >= self.debounce:
+                self.changes.put(pending)
+                pending = set()
@@ -0,0 +1,88 @@
+import os
+import glob
+import time
+from concurrent.futures import ThreadPoolExecutor
+from worlds_install_module import WorldsInstall, LauncherError
+from profile_module import apply_profile
+
+FLEET_WORKERS = 8
+
+def expand_install_dirs(patterns):
+    """ Install directories matching any of the paths or glob patterns, each listed once, in order """
+    seen = set()
+    directories = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern))) if glob.has_magic(pattern) else [os.path.expanduser(pattern)]
+        for path in matches:
+            path = os.path.abspath(path)
+            if os.path.isdir(path) and path not in seen:
+                seen.add(path)
+                directories.append(path)
+    return directories
+
+def read_install_list(list_path):
+    """ Paths or patterns from a text file, one per line; blank lines and # comments are ignored """
+    with open(list_path, 'r') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+class FleetResult:
+    def __init__(self, path):
+        self.path = path
+        self.changes = []  # what was rewritten, as returned by apply_profile
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def status(self):
+        if self.error:
+            return "failed"
+        return "updated" if self.changes else "unchanged"
+
+    def format(self):
+        detail = self.error if self.error else ", ".join(self.changes)
+        return f"{self.status:<10}{self.elapsed * 1000:8.1f} ms  {self.path}" + (f"  ({detail})" if detail else "")
+
+class FleetRunner:
+    """ Applies one Profile to many install directories through a worker pool.
+
+    The server list is the one given (normally the launcher's own), so every install is checked
+    against the same definitions. Each step only writes when the install differs from the profile,
+    so an install already in the target state is reported "unchanged" without any rewrite. """
+
+    def __init__(self, directories, profile, server_config, themes_dir=None, files_list_path=None, workers=FLEET_WORKERS):
+        self.directories = list(directories)
+        self.profile = profile
+        self.server_config = server_config
+        self.themes_dir = themes_dir
+        self.files_list_path = files_list_path
+        self.workers = max(1, workers)
+
+    def run(self, on_result=None):
+        """ Returns one FleetResult per directory, in input order. on_result(result) is called
+        from the worker threads as each install finishes. """
+        if self.profile.theme and not os.path.isdir(os.path.join(self.themes_dir or "", self.profile.theme)):
+            raise LauncherError("Unknown Theme", f"Theme '{self.profile.theme}' was not found in '{self.themes_dir}'.")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.apply_one, path, on_result) for path in self.directories]
+            return [future.result() for future in futures]
+
+    def apply_one(self, path, on_result=None):
+        result = FleetResult(path)
+        started_at = time.perf_counter()
+        try:
+            result.changes = apply_profile(WorldsInstall(path), self.profile, self.server_config, self.themes_dir, self.files_list_path)
+        except LauncherError as e:
+            result.error = str(e).replace("\n", " ")
+        except (OSError, ValueError) as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.elapsed = time.perf_counter() - started_at
+        if on_result:
+            on_result(result)
+        return result
+
+def summarize(results):
+    counts = {"updated": 0, "unchanged": 0, "failed": 0}
+    for result in results:
+        counts[result.status] += 1
+    total = sum(result.elapsed for result in results)
+    return f"{len(results)} installs: {counts['updated']} updated, {counts['unchanged']} unchanged, {counts['failed']} failed ({total:.2f} s of work)"
@@ -0,0 +1,307 @@
+import os
+import shutil
+import tempfile
+
+# Cache of parsed documents: absolute path -> ((mtime_ns, size), IniDocument)
+_document_cache = {}
+
+def _file_signature(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+def _is_comment(clean_line):
+    return clean_line.startswith((';', '#'))
+
+def _is_section_header(clean_line):
+    return clean_line.startswith('[') and clean_line.endswith(']')
+
+class IniDocument:
+    """ Order-preserving .ini document: keeps every original line (comments included) and
+    indexes sections and keys case-insensitively so lookups never rescan the file. """
+
+    def __init__(self, lines=None, path=None):
+        self.path = path
+        self.lines = list(lines or [])
+        self.reindex()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r') as f:
+            return cls(f.readlines(), path=path)
+
+    def reindex(self):
+        # section_ranges: lower section name -> [header_index, end_index) of its first occurrence
+        # section_keys: (lower section name, lower key) -> line index of its first occurrence
+        # first_keys: lower key -> line index of its first occurrence anywhere in the file
+        self.section_order = []
+        self.section_ranges = {}
+        self.section_keys = {}
+        self.first_keys = {}
+        current_section = None
+        for i, line in enumerate(self.lines):
+            clean_line = line.strip()
+            if not clean_line or _is_comment(clean_line):
+                continue
+            if _is_section_header(clean_line):
+                if current_section is not None and self.section_ranges[current_section][1] is None:
+                    self.section_ranges[current_section][1] = i
+                current_section = clean_line[1:-1].lower()
+                if current_section not in self.section_ranges:
+                    self.section_ranges[current_section] = [i, None]
+                    self.section_order.append(current_section)
+                continue
+            key, sep, _ = clean_line.partition('=')
+            if not sep:
+                continue
+            key = key.lower()
+            self.first_keys.setdefault(key, i)
+            self.section_keys.setdefault((current_section, key), i)
+        if current_section is not None and self.section_ranges[current_section][1] is None:
+            self.section_ranges[current_section][1] = len(self.lines)
+
+    def has_section(self, section):
+        return section.lower() in self.section_ranges
+
+    def section_range(self, section):
+        """ Returns (header_index, end_index) of a section, or None if it does not exist """
+        bounds = self.section_ranges.get(section.lower())
+        return tuple(bounds) if bounds else None
+
+    def find(self, key, section=None):
+        """ Line index of key (inside section if given, else anywhere in the file), or -1 """
+        if section is None:
+            return self.first_keys.get(key.lower(), -1)
+        return self.section_keys.get((section.lower(), key.lower()), -1)
+
+    def get(self, key, section=None, default=None):
+        index = self.find(key, section)
+        if index == -1:
+            return default
+        return self.lines[index].strip().partition('=')[2]
+
+    def set(self, key, value, section=None):
+        """ Replaces key's line in place (inside section if present there, else its first occurrence),
+        or inserts it right after the section header, creating the section at the top if needed """
+        new_line = f"{key}={value}\n"
+        index = self.find(key, section) if section is not None else -1
+        if index == -1:
+            index = self.find(key)
+        if index != -1:
+            self.lines[index] = new_line
+            return
+        bounds = self.section_range(section) if section is not None else None
+        if bounds:
+            self.lines.insert(bounds[0] + 1, new_line)
+        else:
+            self.lines[0:0] = [f"[{section or 'Gamma'}]\n", new_line]
+        self.reindex()
+
+class IniTransaction:
+    """ Stages any number of key changes and writes them with a single atomic replace on commit().
+    Usable as a context manager: changes are committed on a clean exit and discarded on error. """
+
+    def __init__(self, path, section='Gamma'):
+        self.path = path
+        self.section = section
+        self.changes = {}  # lower key -> (key as written to the file, value, section)
+
+    def set(self, key, value, section=None):
+        self.changes[key.lower()] = (key, str(value), section or self.section)
+
+    def get(self, key, default=None):
+        """ Returns the staged value for key, or default if nothing is staged for it """
+        change = self.changes.get(key.lower())
+        return change[1] if change else default
+
+    def discard(self):
+        self.changes.clear()
+
+    def __len__(self):
+        return len(self.changes)
+
+    def commit(self):
+        """ Applies all staged changes in one write. Returns True if the file was rewritten.
+        Raises FileNotFoundError if the file does not exist. """
+        if not self.changes:
+            return False
+        current = load_ini_document(self.path)
+        document = IniDocument(current.lines, path=current.path)
+        for key, value, section in self.changes.values():
+            document.set(key, value, section)
+        written = document.lines != current.lines
+        if written:
+            save_ini_document(document, self.path)
+        self.changes.clear()
+        return written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+def _current_umask():
+    # The umask can only be read by setting it; done once at import, before any worker thread creates files
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+_UMASK = _current_umask()
+
+def atomic_write_lines(path, lines, mode='w'):
+    """ Writes lines to a temporary file next to path, fsyncs it and renames it over path,
+    so readers (and crashes) only ever see the old or the new complete file.
+    Pass mode='wb' to write bytes. """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode) as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            # mkstemp creates 0600 files; a new file gets the mode open() would have given it
+            os.chmod(temp_path, 0o666 & ~_UMASK)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def load_ini_document(path):
+    """ Returns the parsed document for path, re-reading the file only when its mtime/size changed.
+    Raises FileNotFoundError if the file does not exist. """
+    path = os.path.abspath(path)
+    signature = _file_signature(path)
+    cached = _document_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    document = IniDocument.from_file(path)
+    _document_cache[path] = (signature, document)
+    return document
+
+def save_ini_document(document, path=None):
+    """ Atomically writes document to path (defaults to document.path) and caches it as current """
+    path = os.path.abspath(path or document.path)
+    atomic_write_lines(path, document.lines)
+    document.path = path
+    _document_cache[path] = (_file_signature(path), document)
+
+def invalidate_ini_document(path):
+    _document_cache.pop(os.path.abspath(path), None)
+
+# --- Line-stream transforms ---
+# Each transform takes an iterable of lines and yields the edited lines, so a rewrite made of
+# several edits is a single pass over the file into one output list (see run_transforms).
+
+def run_transforms(lines, transforms):
+    for transform in transforms:
+        lines = transform(lines)
+    return list(lines)
+
+def set_keys(document, assignments, section, skip_sections=(), new_section_at_end=False):
+    """ Writes each key=value of assignments where IniDocument.set would: over the key's line in section,
+    else over its first line elsewhere, else right after the section header, creating the section at the
+    top (or the end, with new_section_at_end) if needed. Positions come from document's index, so this
+    must be the first transform applied to document.lines. Occurrences inside skip_sections (sections
+    dropped later in the pipeline) are ignored. """
+    skipped = [document.section_range(name) for name in skip_sections]
+    skipped = [bounds for bounds in skipped if bounds]
+    replace_at, insert = {}, []
+    for key, value in assignments.items():
+        new_line = f"{key}={value}\n"
+        index = document.find(key, section)
+        if index == -1:
+            index = document.find(key)
+            if any(start <= index < end for start, end in skipped):
+                index = -1
+        if index == -1:
+            insert.append(new_line)
+        else:
+            replace_at[index] = new_line
+    bounds = document.section_range(section)
+    header_index = bounds[0] if bounds else -1
+
+    def transform(lines):
+        if insert and header_index == -1 and not new_section_at_end:
+            yield f"[{section}]\n"
+            yield from insert
+        for i, line in enumerate(lines):
+            yield replace_at.get(i, line)
+            if i == header_index:
+                yield from insert
+        if insert and header_index == -1 and new_section_at_end:
+            yield f"\n[{section}]\n"
+            yield from insert
+    return transform
+
+def drop_sections(section_names):
+    """ Removes every section (header and body) whose lowercased name is in section_names """
+    def transform(lines):
+        dropping = False
+        for line in lines:
+            clean_line = line.strip()
+            if _is_section_header(clean_line):
+                dropping = clean_line[1:-1].lower() in section_names
+            if not dropping:
+                yield line
+    return transform
+
+def insert_into_section(section, new_lines):
+    """ Adds new_lines at the end of section, before its trailing blank lines (so applying the same
+    insert after dropping it again is a no-op), or at the end of the file if the section is missing,
+    where they replace the file's trailing blank lines for the same reason """
+    section = section.lower()
+
+    def transform(lines):
+        inside, found, blanks = False, False, []
+        for line in lines:
+            clean_line = line.strip()
+            if not clean_line:
+                blanks.append(line)
+                continue
+            if inside and _is_section_header(clean_line):
+                yield from new_lines
+                inside = False
+            yield from blanks
+            blanks = []
+            if not found and _is_section_header(clean_line) and clean_line[1:-1].lower() == section:
+                inside = found = True
+            yield line
+        if found and not inside:
+            yield from blanks
+            return
+        yield from new_lines
+        if inside:
+            yield from blanks
+    return transform
+
+def replace_key_lines(replacements):
+    """ replacements maps a lowercased key to the line that replaces every line of that key, or to
+    None to delete them. Keys with a replacement line that never occurred are appended at the end. """
+    def transform(lines):
+        seen, last_line = set(), "\n"
+        for line in lines:
+            key = line.strip().partition('=')[0].strip().lower() if '=' in line else None
+            if key in replacements:
+                seen.add(key)
+                line = replacements[key]
+                if not line:
+                    continue
+            last_line = line
+            yield line
+        for key, new_line in replacements.items():
+            if new_line and key not in seen:
+                if not last_line.endswith('\n'):
+                    yield '\n'
+                last_line = new_line
+                yield new_line
+    return transform
@@ -0,0 +1,158 @@
+import os
+import queue
+import subprocess
+import threading
+import time
+
+def format_runtime(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+class GameProcess:
+    """ A launched game client: its process handle plus start latency, runtime and exit code """
+
+    def __init__(self, executable_path, process, started_at, launch_latency):
+        self.executable_path = executable_path
+        self.process = process
+        self.pid = process.pid
+        self.started_at = started_at
+        self.launch_latency = launch_latency
+        self.ended_at = None
+        self.exit_code = None
+
+    @property
+    def running(self):
+        return self.ended_at is None
+
+    @property
+    def runtime(self):
+        return (self.ended_at or time.monotonic()) - self.started_at
+
+class LaunchManager:
+    """ Starts game clients without blocking the caller. A reaper thread waits on each process and
+    queues it once it exits; dispatch_events() hands those to on_exit on the caller's thread
+    (the Tk loop polls it through window.after, since Tk must not be touched from other threads). """
+
+    def __init__(self, on_exit=None):
+        self.on_exit = on_exit
+        self.processes = {}  # pid -> GameProcess still running
+        self.events = queue.Queue()
+        self.lock = threading.Lock()
+
+    def launch(self, executable_path, args=None, on_reaped=None):
+        """ Starts executable_path and returns its GameProcess. on_reaped, if given, is called
+        from the reaper thread as soon as the process exits. """
+        started_at = time.monotonic()
+        process = subprocess.Popen([executable_path] + list(args or []), cwd=os.path.dirname(executable_path) or None)
+        game_process = GameProcess(executable_path, process, started_at, time.monotonic() - started_at)
+        with self.lock:
+            self.processes[game_process.pid] = game_process
+        threading.Thread(target=self._reap, args=(game_process, on_reaped), daemon=True).start()
+        return game_process
+
+    def _reap(self, game_process, on_reaped):
+        exit_code = game_process.process.wait()
+        game_process.exit_code = exit_code
+        game_process.ended_at = time.monotonic()
+        with self.lock:
+            self.processes.pop(game_process.pid, None)
+        if on_reaped:
+            on_reaped(game_process)
+        self.events.put(game_process)
+
+    def running(self):
+        with self.lock:
+            return list(self.processes.values())
+
+    def dispatch_events(self):
+        """ Delivers every finished process to on_exit. Returns how many were delivered. """
+        delivered = 0
+        while True:
+            try:
+                game_process = self.events.get_nowait()
+            except queue.Empty:
+                return delivered
+            delivered += 1
+            if self.on_exit:
+                self.on_exit(game_process)
+
+    def terminate_all(self):
+        for game_process in self.running():
+            try:
+                game_process.process.terminate()
+            except OSError:
+                pass
+
+class InstanceSlot:
+    """ One row of a MultiLaunch: the GameProcess once started, or the error that prevented it """
+
+    def __init__(self, number):
+        self.number = number
+        self.game_process = None
+        self.error = None
+
+    @property
+    def status(self):
+        if self.error:
+            return f"failed: {self.error}"
+        if self.game_process is None:
+            return "waiting"
+        if self.game_process.running:
+            return f"running {format_runtime(self.game_process.runtime)}"
+        return f"exited {self.game_process.exit_code} after {format_runtime(self.game_process.runtime)}"
+
+class MultiLaunch:
+    """ Starts count clients of one executable from a worker thread, spacing them stagger seconds
+    apart and never keeping more than max_concurrent of them running at once (0 = no cap) """
+
+    def __init__(self, manager, executable_path, count, stagger=2.0, max_concurrent=0):
+        self.manager = manager
+        self.executable_path = executable_path
+        self.stagger = max(0.0, stagger)
+        self.slots = [InstanceSlot(i + 1) for i in range(count)]
+        self.capacity = threading.Semaphore(max_concurrent) if max_concurrent > 0 else None
+        self.cancelled = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        """ Stops starting new instances; clients already running are left alone """
+        self.cancelled.set()
+
+    @property
+    def finished(self):
+        return self.thread is not None and not self.thread.is_alive()
+
+    def _run(self):
+        for slot in self.slots:
+            if self.capacity:
+                while not self.capacity.acquire(timeout=0.2):
+                    if self.cancelled.is_set():
+                        return
+            # The slot's capacity is handed to the game process once it starts (released when it is reaped)
+            started = False
+            try:
+                if self.cancelled.is_set():
+                    return
+                slot.game_process = self.manager.launch(self.executable_path, on_reaped=self._release)
+                started = True
+            except OSError as e:
+                slot.error = e.strerror or str(e)
+            except Exception as e:
+                # Whatever goes wrong with one client, the others are still started
+                slot.error = str(e) or type(e).__name__
+            finally:
+                if not started:
+                    self._release(None)
+            if slot is not self.slots[-1] and self.cancelled.wait(self.stagger):
+                return
+
+    def _release(self, game_process):
+        if self.capacity:
+            self.capacity.release()
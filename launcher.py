@@ -1,17 +1,7 @@
-import customtkinter as ctk
-from theme_selector_module import ThemeSelectorWindow
-import tkinter as tk
-from tkinter import messagebox
+import time
+_startup_started_at = time.perf_counter()
 import os
 import sys
-import subprocess
-import json
-import shutil
-from PIL import Image, ImageTk
-
-# --- CustomTkinter Setup ---
-ctk.set_appearance_mode("Dark")
-ctk.set_default_color_theme("dark-blue")
 
 # --- Determine the base path for external files ---
 if getattr(sys, 'frozen', False):
@@ -19,6 +9,39 @@ if getattr(sys, 'frozen', False):
 else:
     application_path = os.path.dirname(os.path.abspath(__file__))
 
+# --- HEADLESS MODE: command-line options apply settings and launch without loading the GUI toolkit ---
+# Options the GUI understands itself; anything else on the command line selects headless mode.
+# Checked here rather than in launcher_cli_module, which would import the whole CLI on every GUI start.
+GUI_OPTIONS = ("--startup-timing",)
+
+if __name__ == "__main__" and any(arg not in GUI_OPTIONS for arg in sys.argv[1:]):
+    from launcher_cli_module import main
+    sys.exit(main(sys.argv[1:], application_path))
+
+import customtkinter as ctk  # Also imports tkinter and PIL
+_toolkit_imported_at = time.perf_counter()
+from ini_document_module import invalidate_ini_document
+from worlds_install_module import WorldsInstall, LauncherError, INI_FILE_NAME, OVERRIDE_FILE_NAME, MAX_AVATARS, bundled_theme_paths
+from file_watcher_module import FileWatcher, WATCH_POLL_INTERVAL
+from server_probe_module import ServerProber, LatencyHistory, pick_fastest_server, AUTO_SERVER_OPTION, LATENCY_HISTORY_PATH
+from launch_manager_module import LaunchManager, MultiLaunch, format_runtime
+from asset_cache_module import AssetCache, ASSET_CACHE_DIR
+from server_list_module import ServerListView
+import tkinter as tk
+from tkinter import messagebox, filedialog
+import math
+import queue
+import threading
+# The theme selector, profiles, cache tools and catalog import are imported by the handlers that open
+# them. server_probe_module (and asyncio) stays here: the prober starts with the window.
+_imports_done_at = time.perf_counter()
+
+# --- CustomTkinter Setup ---
+ctk.set_appearance_mode("Dark")
+ctk.set_default_color_theme("dark-blue")
+
+install = WorldsInstall(application_path)
+
 # --- SPECIAL FUNCTION FOR INTERNAL (PACKAGED) FILES ---
 def resource_path(relative_path):
     """ Get the absolute path to a resource, works for development and for PyInstaller """
@@ -28,14 +51,46 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+# --- STARTUP TIMING (--startup-timing or LAUNCHER_STARTUP_TIMING=1) ---
+class StartupTimer:
+    """ Charges the wall time since the previous mark() to the named phase """
+    def __init__(self, started_at):
+        self.started_at = started_at
+        self.last_mark = started_at
+        self.phases = {}
+
+    def mark(self, phase, now=None):
+        """ now: the end of the phase, if it was recorded earlier (defaults to the current time) """
+        now = time.perf_counter() if now is None else now
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self.last_mark)
+        self.last_mark = now
+
+    def report(self):
+        lines = ["Startup timing:"]
+        for phase, seconds in self.phases.items():
+            lines.append(f"  {phase:<24}{seconds * 1000:8.1f} ms")
+        lines.append(f"  {'total':<24}{(self.last_mark - self.started_at) * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+STARTUP_TIMING_ENABLED = "--startup-timing" in sys.argv or os.environ.get("LAUNCHER_STARTUP_TIMING") == "1"
+startup_timer = StartupTimer(_startup_started_at)
+startup_timer.mark("import customtkinter", _toolkit_imported_at)
+startup_timer.mark("import launcher modules", _imports_done_at)
+startup_timer.mark("setup")
+
 # --- 1. FILE CONFIGURATION ---
-INI_FILE_NAME = 'worlds.ini'
-OVERRIDE_FILE_NAME = 'override.ini'
-EXECUTABLE_NAME = 'run.exe'
-FALLBACK_EXECUTABLE_NAME = 'WorldsPlayer.exe'
 ICON_NAME = 'worldsserverselection.ico'
 BACKGROUND_IMAGE_NAME = 'serverselectionbackground2.png'
-SERVER_CONFIG_FILE = 'worldsserverselection.json'
+BACKGROUND_SIZE = (1455, 664)
+WORLDS_COMMIT_DELAY_MS = 500
+LAUNCH_POLL_MS = 250
+WATCH_PUMP_MS = 250
+PROBE_PUMP_MS = 250
+RACE_POLL_MS = 50
+SERVER_SAVE_DELAY_MS = 500
+CACHE_POLL_MS = 100
+DEFAULT_CACHE_MAX_MB = 2048
+DEFAULT_CACHE_MAX_AGE_DAYS = 30
 
 # --- 2. LOGIC FUNCTIONS ---
 def create_default_override_ini():
@@ -121,105 +176,51 @@ handshakeID=1119430730
     try:
         with open(worlds_path, 'w') as f:
             f.write(default_content)
+        invalidate_ini_document(worlds_path)
         messagebox.showinfo("Success", f"Default '{INI_FILE_NAME}' has been created.")
         refresh_all_indicators()
     except Exception as e:
         messagebox.showerror("Error", f"Could not create '{INI_FILE_NAME}'.\nError: {e}")
 
-def check_setting_status(setting_name, default_active=False):
-    try:
-        worlds_path = os.path.join(application_path, INI_FILE_NAME)
-        with open(worlds_path, 'r') as f:
-            for line in f:
-                clean_line = line.strip().lower()
-                if clean_line.startswith(f"{setting_name.lower()}="):
-                    if setting_name.lower() == 'disableshaper':
-                        return clean_line.endswith("=0")
-                    return clean_line.endswith("=1")
-        return default_active
-    except FileNotFoundError:
-        return default_active
-
-def toggle_setting_action(setting_name, setting_name_in_file, default_active=False):
+def check_setting_status(setting_name, default_active=False, transaction=None):
+    return install.setting_status(setting_name, default_active, transaction)
+
+def commit_worlds_changes(transaction):
     try:
-        worlds_path = os.path.join(application_path, INI_FILE_NAME)
-        is_active = check_setting_status(setting_name, default_active)
-        if setting_name.lower() == 'disableshaper':
-            new_line = f"{setting_name_in_file}=1\n" if is_active else f"{setting_name_in_file}=0\n"
-        else:
-            new_line = f"{setting_name_in_file}=0\n" if is_active else f"{setting_name_in_file}=1\n"
-        try:
-            with open(worlds_path, 'r') as f:
-                lines = f.readlines()
-        except FileNotFoundError:
-            messagebox.showerror("File Not Found", f"'{INI_FILE_NAME}' could not be found.")
-            return
-        gamma_index, setting_index = -1, -1
-        for i, line in enumerate(lines):
-            clean_line = line.strip().lower()
-            if clean_line == "[gamma]":
-                gamma_index = i
-            elif clean_line.startswith(f"{setting_name.lower()}="):
-                setting_index = i
-        if setting_index != -1:
-            lines[setting_index] = new_line
-        else:
-            if gamma_index != -1:
-                lines.insert(gamma_index + 1, new_line)
-            else:
-                lines.insert(0, "[Gamma]\n")
-                lines.insert(1, new_line)
-        with open(worlds_path, 'w') as f:
-            f.writelines(lines)
+        install.commit(transaction)
+        return True
+    except LauncherError as e:
+        messagebox.showerror(e.title, str(e))
     except Exception as e:
+        transaction.discard()
         messagebox.showerror("Error", f"An error occurred while modifying worlds.ini:\n{e}")
+    return False
+
+def toggle_setting_action(setting_name, setting_name_in_file, default_active=False, transaction=None):
+    # With a transaction the change is only staged; the caller decides when to commit it
+    new_value = install.toggled_value(setting_name, default_active, transaction)
+    if transaction is not None:
+        transaction.set(setting_name_in_file, new_value)
+        return
+    transaction = install.transaction()
+    transaction.set(setting_name_in_file, new_value)
+    commit_worlds_changes(transaction)
 
 def get_avatars_value():
-    try:
-        worlds_path = os.path.join(application_path, INI_FILE_NAME)
-        with open(worlds_path, 'r') as f:
-            for line in f:
-                clean_line = line.strip().lower()
-                if clean_line.startswith("avatars="):
-                    value = clean_line.split('=')[1]
-                    return int(value)
-        return 16
-    except (FileNotFoundError, ValueError):
-        return 16
-
-def set_avatars_value(new_value):
-    try:
-        worlds_path = os.path.join(application_path, INI_FILE_NAME)
-        new_line = f"avatars={new_value}\n"
-        try:
-            with open(worlds_path, 'r') as f:
-                lines = f.readlines()
-        except FileNotFoundError:
-            messagebox.showerror("File Not Found", f"'{INI_FILE_NAME}' could not be found.")
-            return
-        gamma_index, setting_index = -1, -1
-        for i, line in enumerate(lines):
-            clean_line = line.strip().lower()
-            if clean_line == "[gamma]":
-                gamma_index = i
-            elif clean_line.startswith("avatars="):
-                setting_index = i
-        if setting_index != -1:
-            lines[setting_index] = new_line
-        else:
-            if gamma_index != -1:
-                lines.insert(gamma_index + 1, new_line)
-            else:
-                lines.insert(0, "[Gamma]\n")
-                lines.insert(1, new_line)
-        with open(worlds_path, 'w') as f:
-            f.writelines(lines)
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while modifying worlds.ini:\n{e}")
+    return install.avatars()
+
+def set_avatars_value(new_value, transaction=None):
+    if transaction is not None:
+        transaction.set("avatars", new_value)
+        return
+    transaction = install.transaction()
+    transaction.set("avatars", new_value)
+    commit_worlds_changes(transaction)
 
 def clean_cache():
+    from cache_module import CacheCleaner, CACHE_DIR_NAME
     try:
-        cache_dir = os.path.join(application_path, 'cachedir')
+        cache_dir = os.path.join(application_path, CACHE_DIR_NAME)
         if not os.path.isdir(cache_dir):
             messagebox.showinfo("Cache Clean", "Cache folder ('cachedir') not found. Nothing to do.")
             return
@@ -230,143 +231,211 @@ def clean_cache():
         response = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete {len(items_to_delete)} items from the cache folder?")
         if not response:
             return
-        for filename in items_to_delete:
-            file_path = os.path.join(cache_dir, filename)
-            if os.path.isfile(file_path) or os.path.islink(file_path):
-                os.unlink(file_path)
-            elif os.path.isdir(file_path):
-                shutil.rmtree(file_path)
-        messagebox.showinfo("Success", f"Successfully cleaned {len(items_to_delete)} items from the cache.")
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred while cleaning the cache:\n{e}")
+        return
+
+    run_cache_cleaner(CacheCleaner(cache_dir), "Cleaning Cache")
+
+def run_cache_cleaner(cleaner, title):
+    from cache_module import format_size
+    # The deletion itself runs on a worker thread; this dialog only polls its counters
+    progress_window = ctk.CTkToplevel(window)
+    progress_window.title(title)
+    progress_window.geometry("360x140")
+    progress_window.resizable(False, False)
+    progress_window.transient(window)
+    progress_window.protocol("WM_DELETE_WINDOW", cleaner.cancel)
+
+    progress_label = ctk.CTkLabel(progress_window, text="Scanning cache folder...", font=('Roboto Medium', 12))
+    progress_label.pack(pady=(25, 15))
+    cancel_button = ctk.CTkButton(progress_window, text="Cancel", command=cleaner.cancel, fg_color="transparent", border_width=1)
+    cancel_button.pack()
+
+    def poll_cleaner():
+        if cleaner.policy is not None and cleaner.files_selected is None:
+            progress_label.configure(text="Indexing cache folder...")
+        else:
+            of_total = f" of {cleaner.files_selected}" if cleaner.files_selected is not None else ""
+            progress_label.configure(text=f"Deleted {cleaner.files_deleted}{of_total} files ({format_size(cleaner.bytes_freed)} freed)")
+        if not cleaner.finished.is_set():
+            progress_window.after(CACHE_POLL_MS, poll_cleaner)
+            return
+        progress_window.destroy()
+        summary = f"{cleaner.files_deleted} files deleted, {format_size(cleaner.bytes_freed)} reclaimed."
+        if cleaner.policy is not None:
+            summary += f"\n{cleaner.files_scanned - cleaner.files_deleted} files kept."
+        if cleaner.error:
+            messagebox.showerror("Error", f"An error occurred while cleaning the cache:\n{cleaner.error}\n{summary}")
+        elif cleaner.errors:
+            messagebox.showerror("Error", f"Cache clean finished with errors.\n{summary}\n{len(cleaner.errors)} files or folders could not be deleted, e.g.:\n{cleaner.errors[0][1]}")
+        elif cleaner.cancelled:
+            messagebox.showinfo("Cache Clean", f"Cache clean cancelled.\n{summary}")
+        else:
+            messagebox.showinfo("Success", f"Successfully cleaned the cache.\n{summary}")
+
+    cleaner.start()
+    poll_cleaner()
+
+def open_trim_cache_window():
+    from cache_module import CacheCleaner, EvictionPolicy, CACHE_DIR_NAME
+    cache_dir = os.path.join(application_path, CACHE_DIR_NAME)
+    if not os.path.isdir(cache_dir):
+        messagebox.showinfo("Cache Clean", "Cache folder ('cachedir') not found. Nothing to do.")
+        return
+
+    trim_window = ctk.CTkToplevel(window)
+    trim_window.title("Trim Cache")
+    trim_window.geometry("420x220")
+    trim_window.resizable(False, False)
+    trim_window.transient(window)
+    trim_window.grab_set()
+
+    ctk.CTkLabel(trim_window, text="Delete least recently used files until the cache fits.\nLeave a field empty to disable that limit.",
+                 font=('Roboto Medium', 11), justify='left').pack(pady=(20, 10))
+
+    form_frame = ctk.CTkFrame(trim_window, fg_color="transparent")
+    form_frame.pack(padx=20)
+    entries = {}
+    for row, (label_text, default) in enumerate((("Max cache size (MB)", DEFAULT_CACHE_MAX_MB), ("Max unused age (days)", DEFAULT_CACHE_MAX_AGE_DAYS))):
+        ctk.CTkLabel(form_frame, text=label_text + ":", width=180, anchor='w').grid(row=row, column=0, pady=4)
+        entry = ctk.CTkEntry(form_frame, width=100)
+        entry.insert(0, str(default))
+        entry.grid(row=row, column=1, pady=4)
+        entries[label_text] = entry
+
+    def read_limit(label_text, allow_zero):
+        """ The field's value as a finite number (None if empty); raises ValueError otherwise """
+        text = entries[label_text].get().strip()
+        if not text:
+            return None
+        value = float(text)
+        if not math.isfinite(value) or value < 0 or (value == 0 and not allow_zero):
+            raise ValueError(f"{label_text}: {text}")
+        return value
+
+    def start_trim():
+        try:
+            max_mb = read_limit("Max cache size (MB)", allow_zero=True)
+            max_days = read_limit("Max unused age (days)", allow_zero=False)
+            policy = EvictionPolicy(max_total_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else None,
+                                    max_age_days=max_days)
+        except (ValueError, OverflowError):
+            messagebox.showerror("Invalid Input", "Please enter a size of 0 MB or more and an age of more than 0 days.", parent=trim_window)
+            return
+        if policy.max_total_bytes is None and policy.max_age_days is None:
+            messagebox.showerror("Invalid Input", "Set at least one limit, or use CLEAN CACHE to delete everything.", parent=trim_window)
+            return
+        trim_window.destroy()
+        run_cache_cleaner(CacheCleaner(cache_dir, policy), "Trimming Cache")
+
+    ctk.CTkButton(trim_window, text="Trim Cache", command=start_trim).pack(pady=15)
+
+def open_cache_report_window():
+    from cache_module import CacheAnalyzer, CACHE_DIR_NAME, HASH_CACHE_PATH, format_size
+    cache_dir = os.path.join(application_path, CACHE_DIR_NAME)
+    if not os.path.isdir(cache_dir):
+        messagebox.showinfo("Cache Report", "Cache folder ('cachedir') not found. Nothing to do.")
+        return
+
+    analyzer = CacheAnalyzer(cache_dir, os.path.join(application_path, HASH_CACHE_PATH))
+    report_window = ctk.CTkToplevel(window)
+    report_window.title("Cache Report")
+    report_window.geometry("700x520")
+    report_window.transient(window)
+
+    def on_close():
+        analyzer.cancel()
+        report_window.destroy()
+    report_window.protocol("WM_DELETE_WINDOW", on_close)
+
+    report_text = ctk.CTkTextbox(report_window, font=('Consolas', 12))
+    report_text.pack(fill='both', expand=True, padx=20, pady=(20, 10))
+    status_label = ctk.CTkLabel(report_window, text="", font=('Roboto Medium', 11), text_color='gray')
+    status_label.pack()
+
+    def show_report():
+        report_text.configure(state='normal')
+        report_text.delete("1.0", "end")
+        report_text.insert("1.0", analyzer.report.format())
+        report_text.configure(state='disabled')
+
+    def poll_analyzer():
+        if not report_window.winfo_exists():
+            return
+        status_label.configure(text=f"{analyzer.stage}... {analyzer.done}/{analyzer.total}" if analyzer.total else f"{analyzer.stage}...")
+        if not analyzer.finished.is_set():
+            report_window.after(CACHE_POLL_MS, poll_analyzer)
+            return
+        if analyzer.error:
+            status_label.configure(text=f"Error: {analyzer.error}", text_color='red')
+            return
+        show_report()
+        if analyzer.stage == "Linking":
+            status_label.configure(text=f"{analyzer.linked_files} duplicates replaced by hardlinks, {format_size(analyzer.linked_bytes)} reclaimed."
+                                        + (f" {len(analyzer.link_errors)} could not be linked." if analyzer.link_errors else "")
+                                        + (f" {analyzer.changed_files} skipped (changed since the scan)." if analyzer.changed_files else ""))
+        else:
+            status_label.configure(text="Scan complete.")
+            dedup_button.configure(state='normal' if analyzer.report.duplicate_groups else 'disabled')
+
+    def start_dedup():
+        response = messagebox.askyesno("Confirm Deduplication",
+                                       f"Replace duplicate cache files with hardlinks to reclaim {format_size(analyzer.report.reclaimable_bytes)}?\n\n"
+                                       "Hardlinked files share one copy on disk: if the game later rewrites one of them in place, "
+                                       "the others change with it. Files changed since the scan are left alone.", parent=report_window)
+        if not response:
+            return
+        dedup_button.configure(state='disabled')
+        analyzer.start(deduplicate=True)
+        poll_analyzer()
+
+    dedup_button = ctk.CTkButton(report_window, text="Deduplicate (Hardlink)", command=start_dedup, state='disabled')
+    dedup_button.pack(pady=10)
+
+    analyzer.start()
+    poll_analyzer()
 
 def load_full_config():
     try:
-        server_config_path = os.path.join(application_path, SERVER_CONFIG_FILE)
-        if not os.path.isfile(server_config_path):
-            default_config = {"server_selection": {"LibreWorlds": {"address": "[test.libreworlds.org:32147]","world_server": "WorldServer=worldserver://test.libreworlds.org:32147"},"Official": {"address": "[test.3dcd.com:6650]","world_server": "WorldServer=worldserver://http://us1.worlds.net/3DCDup"},"Worlio": {"address": "[worlio.com:6650]","world_server": "WorldServer=worldserver://worlio.com:6650/"}},"updating_server": {"Nothing": {},"Remove": {},"LibreWorlds": {"upgrade_server": "upgradeServer=http://upgrade.libreworlds.org/3DCDup","script_server": "scriptServer=http://script.libreworlds.org"},"Official": {"upgrade_server": "upgradeServer=http://us1.worlds.net/3DCDup","script_server": None},"Worlio": {"upgrade_server": "UpgradeServer=http://files.worlio.com/DCDup/","script_server": "ScriptServer=http://files.worlio.com/cgi-bin/"},"Jett": {"upgrade_server": "upgradeServer=http://jett.dacii.net/3DCDup/","script_server": "ScriptServer=http://jett.dacii.net/cgi-bin/"}}}
-            with open(server_config_path, 'w') as f:
-                json.dump(default_config, f, indent=4)
-        with open(server_config_path, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        messagebox.showerror("Critical Error", f"Could not create or read '{SERVER_CONFIG_FILE}'.\nError: {e}")
+        return install.load_server_config()
+    except LauncherError as e:
+        messagebox.showerror(e.title, str(e))
         return None
 
 def detect_current_server(configurations):
-    try:
-        worlds_path = os.path.join(application_path, INI_FILE_NAME)
-        override_path = os.path.join(application_path, OVERRIDE_FILE_NAME)
-        with open(worlds_path, 'r') as f:
-            worlds_content = f.read()
-        with open(override_path, 'r') as f:
-            override_content = f.read()
-        for server_name, server_data in configurations.items():
-            if "address" in server_data and "world_server" in server_data:
-                address_line = server_data["address"]
-                worldserver_line = server_data["world_server"]
-                if address_line.strip() in worlds_content and worldserver_line.strip() in override_content:
-                    return server_name
-    except Exception:
-        return None
-    return None
+    return install.detect_current_server(configurations)
+
+def apply_server_changes(server_option, updating_option, server_config_map, updating_config_map):
+    install.apply_server_changes(server_option, updating_option, server_config_map, updating_config_map)
 
 def apply_changes_and_launch(server_option, updating_option, server_config_map, updating_config_map):
     try:
-        if not os.path.isfile(os.path.join(application_path, INI_FILE_NAME)) or not os.path.isfile(os.path.join(application_path, OVERRIDE_FILE_NAME)):
-            messagebox.showerror("File Not Found", f"Could not find '{INI_FILE_NAME}' or '{OVERRIDE_FILE_NAME}'. They must be in the same folder as the launcher.")
-            return
-        run_exe_path = os.path.join(application_path, EXECUTABLE_NAME)
-        game_version = 'new'
-        if os.path.isfile(run_exe_path):
-            game_version = 'old'
-        selected_server_config = server_config_map[server_option]
-        new_address = selected_server_config["address"]
-        new_world_server = selected_server_config["world_server"]
-        override_path = os.path.join(application_path, OVERRIDE_FILE_NAME)
-        with open(override_path, 'r') as f:
-            override_lines = f.readlines()
-        runtime_index, worldserver_index = -1, -1
-        for i, line in enumerate(override_lines):
-            clean_line = line.strip().lower()
-            if clean_line == "[runtime]":
-                runtime_index = i
-            elif clean_line.startswith("worldserver="):
-                worldserver_index = i
-        if worldserver_index != -1:
-            override_lines[worldserver_index] = new_world_server + '\n'
-        elif runtime_index != -1:
-            override_lines.insert(runtime_index + 1, new_world_server + '\n')
-        else:
-            override_lines.append("\n[Runtime]\n")
-            override_lines.append(new_world_server + '\n')
-        with open(override_path, 'w') as f:
-            f.writelines(override_lines)
-        worlds_path = os.path.join(application_path, INI_FILE_NAME)
-        with open(worlds_path, 'r') as f:
-            worlds_lines = f.readlines()
-        address_lines_to_replace = [config["address"].strip().lower() for config in server_config_map.values()]
-        new_worlds_lines = []
-        section_to_delete = False
-        for line in worlds_lines:
-            clean_line = line.strip()
-            if clean_line.startswith('[') and clean_line.endswith(']'):
-                section_to_delete = clean_line.lower() in address_lines_to_replace
-            if not section_to_delete:
-                new_worlds_lines.append(line)
-        if game_version == 'old':
-            try:
-                start_index = [l.strip().lower() for l in new_worlds_lines].index('[installedworlds]')
-                end_index = start_index + 1
-                while end_index < len(new_worlds_lines) and not new_worlds_lines[end_index].strip().startswith('['):
-                    end_index += 1
-                new_worlds_lines.insert(end_index, '\n' + new_address + '\n')
-            except ValueError:
-                new_worlds_lines.append('\n' + new_address + '\n')
-        if updating_option and updating_option != "Nothing":
-            if updating_option == "Remove":
-                new_worlds_lines = [line for line in new_worlds_lines if not line.strip().lower().startswith(("upgradeserver=", "scriptserver="))]
-            else:
-                selected_updating_config = updating_config_map[updating_option]
-                new_upgrade_server = selected_updating_config.get("upgrade_server")
-                new_script_server = selected_updating_config.get("script_server")
-                found_upgrade, found_script = False, False
-                final_lines = []
-                for line in new_worlds_lines:
-                    line_lower = line.strip().lower()
-                    if line_lower.startswith("upgradeserver="):
-                        if new_upgrade_server: final_lines.append(new_upgrade_server + '\n')
-                        found_upgrade = True
-                    elif line_lower.startswith("scriptserver="):
-                        if new_script_server: final_lines.append(new_script_server + '\n')
-                        found_script = True
-                    else:
-                        final_lines.append(line)
-                new_worlds_lines = final_lines
-                if not found_upgrade and new_upgrade_server: new_worlds_lines.append(new_upgrade_server + '\n')
-                if not found_script and new_script_server: new_worlds_lines.append(new_script_server + '\n')
-        with open(worlds_path, 'w') as f:
-            f.writelines(new_worlds_lines)
-        worldsplayer_exe_path = os.path.join(application_path, FALLBACK_EXECUTABLE_NAME)
-        if os.path.isfile(run_exe_path):
-            subprocess.run([run_exe_path])
-        elif os.path.isfile(worldsplayer_exe_path):
-            subprocess.run([worldsplayer_exe_path])
-        else:
-            messagebox.showerror("Executable Not Found", f"Could not find '{EXECUTABLE_NAME}' or '{FALLBACK_EXECUTABLE_NAME}'.\nPlease ensure one of them is in the program folder.")
+        install.require_ini_files()
+        if launch_manager.running() and not check_setting_status("multirun"):
+            messagebox.showwarning("Already Running", "The game is already running.\nEnable MULTIRUN to start more than one client.")
             return
-        window.quit()
+        apply_server_changes(server_option, updating_option, server_config_map, updating_config_map)
+        executable_path = install.require_executable()
+        game_process = launch_manager.launch(executable_path)
+        launch_status_var.set(f"Started {os.path.basename(game_process.executable_path)} (PID {game_process.pid}) - {len(launch_manager.running())} running")
+    except LauncherError as e:
+        messagebox.showerror(e.title, str(e))
     except Exception as e:
         messagebox.showerror("Unexpected Error", f"An unexpected error has occurred:\n{e}")
 
 # --- 3. PROGRAM START AND GUI ---
 class ToolButton(ctk.CTkFrame):
-    def __init__(self, parent, text, setting_name, setting_name_in_file, file_exists_status, default_active=False, font_size=12):
+    def __init__(self, parent, text, setting_name, setting_name_in_file, file_exists_status, default_active=False, font_size=12,
+                 transaction=None, on_change=None):
         super().__init__(parent, fg_color="transparent")
         self.setting_name = setting_name
         self.setting_name_in_file = setting_name_in_file
         self.file_exists = file_exists_status
         self.default_active = default_active
+        # Shared IniTransaction the click is staged into, and a callback to schedule its commit
+        self.transaction = transaction
+        self.on_change = on_change
 
         # Status Indicator (Red/Green Dot)
         self.indicator_frame = ctk.CTkFrame(self, width=15, height=15, corner_radius=15)
@@ -383,19 +452,22 @@ class ToolButton(ctk.CTkFrame):
         if not self.file_exists:
             color = 'red'
         else:
-            color = 'green' if check_setting_status(self.setting_name, self.default_active) else 'red'
+            color = 'green' if check_setting_status(self.setting_name, self.default_active, self.transaction) else 'red'
         self.indicator_frame.configure(fg_color=color)
 
     def on_click(self):
         if not self.file_exists:
             return
-        toggle_setting_action(self.setting_name, self.setting_name_in_file, self.default_active)
+        toggle_setting_action(self.setting_name, self.setting_name_in_file, self.default_active, self.transaction)
         self.update_indicator()
+        if self.on_change:
+            self.on_change()
 
 if __name__ == "__main__":
     worlds_ini_exists = os.path.isfile(os.path.join(application_path, INI_FILE_NAME))
     override_ini_exists = os.path.isfile(os.path.join(application_path, OVERRIDE_FILE_NAME))
     full_config = load_full_config()
+    startup_timer.mark("config load")
     
     if full_config:
         SERVER_SELECTION_CONFIG = full_config.get("server_selection", {})
@@ -408,15 +480,42 @@ if __name__ == "__main__":
 
         tool_buttons = []
 
+        # Tool toggles and max players are staged here and written to worlds.ini in one atomic commit
+        worlds_changes = install.transaction()
+        worlds_commit_job = None
+
+        def flush_worlds_changes():
+            global worlds_commit_job
+            if worlds_commit_job is not None:
+                window.after_cancel(worlds_commit_job)
+                worlds_commit_job = None
+            if not worlds_changes:
+                return True
+            committed = commit_worlds_changes(worlds_changes)
+            for tool in tool_buttons:
+                tool.update_indicator()
+            return committed
+
+        def schedule_worlds_commit():
+            global worlds_commit_job
+            if worlds_commit_job is not None:
+                window.after_cancel(worlds_commit_job)
+            worlds_commit_job = window.after(WORLDS_COMMIT_DELAY_MS, flush_worlds_changes)
+
+        startup_timer.mark("widget build")
         try:
             icon_path = resource_path(ICON_NAME)
             window.iconbitmap(icon_path)
             
-            # Application Background Image
-            background_path = resource_path(BACKGROUND_IMAGE_NAME)
-            pil_image = Image.open(background_path)
-            pil_image = pil_image.resize((1455, 664), Image.Resampling.LANCZOS)
-            background_image_obj = ImageTk.PhotoImage(pil_image)
+            # Application Background Image: scaled once, then loaded straight by Tk from the asset cache
+            asset_cache = AssetCache(os.path.join(application_path, ASSET_CACHE_DIR))
+            background_path = asset_cache.scaled_path(resource_path(BACKGROUND_IMAGE_NAME), BACKGROUND_SIZE)
+            if background_path:
+                background_image_obj = tk.PhotoImage(file=background_path)
+            else:
+                # The cache could not be written: show the copy scaled in memory
+                from PIL import ImageTk
+                background_image_obj = ImageTk.PhotoImage(asset_cache.get(resource_path(BACKGROUND_IMAGE_NAME), BACKGROUND_SIZE))
             
             background_label = tk.Label(window, image=background_image_obj, bg="black")
             background_label.place(x=0, y=0, relwidth=1, relheight=1)
@@ -425,6 +524,7 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Error loading assets: {e}")
             background_label = None
+        startup_timer.mark("background decode")
 
         # Main Central Container
         main_container = ctk.CTkFrame(window, width=900, height=520, corner_radius=10, fg_color="#1a1a1a")
@@ -440,19 +540,11 @@ if __name__ == "__main__":
         frame_tools = ctk.CTkScrollableFrame(main_container, label_text="TOOLS", label_font=('Roboto Medium', 18))
         frame_tools.grid(row=0, column=0, sticky='nsew', padx=10, pady=10)
 
-        def refresh_all_indicators():
-            global worlds_ini_exists, override_ini_exists
+        def refresh_worlds_indicators():
+            global worlds_ini_exists
             worlds_ini_exists = os.path.isfile(os.path.join(application_path, INI_FILE_NAME))
-            override_ini_exists = os.path.isfile(os.path.join(application_path, OVERRIDE_FILE_NAME))
-            
-            # File Status Colors
-            col_worlds = 'green' if worlds_ini_exists else 'red'
-            col_override = 'green' if override_ini_exists else 'red'
-            
             if 'worlds_dot_frame' in globals():
-                worlds_dot_frame.configure(fg_color=col_worlds)
-            if 'override_dot_frame' in globals():
-                override_dot_frame.configure(fg_color=col_override)
+                worlds_dot_frame.configure(fg_color='green' if worlds_ini_exists else 'red')
                 
             for tool in tool_buttons:
                 tool.file_exists = worlds_ini_exists
@@ -465,6 +557,16 @@ if __name__ == "__main__":
                 entry_avatars.configure(state='disabled')
                 avatar_value_var.set("N/A")
 
+        def refresh_override_indicator():
+            global override_ini_exists
+            override_ini_exists = os.path.isfile(os.path.join(application_path, OVERRIDE_FILE_NAME))
+            if 'override_dot_frame' in globals():
+                override_dot_frame.configure(fg_color='green' if override_ini_exists else 'red')
+
+        def refresh_all_indicators():
+            refresh_worlds_indicators()
+            refresh_override_indicator()
+
         # File Management Buttons
         frame_file_management = ctk.CTkFrame(frame_tools, fg_color="transparent")
         frame_file_management.pack(pady=5, fill='x', padx=5)
@@ -485,34 +587,64 @@ if __name__ == "__main__":
                                        command=lambda: open_add_server_window())
         btn_add_server.pack(pady=5, fill='x', padx=5)
 
+        btn_import_servers = ctk.CTkButton(frame_tools, text="IMPORT SERVERS", font=('Roboto Medium', 9, 'bold'), 
+                                           fg_color='#006400', hover_color='#004d00', 
+                                           command=lambda: import_server_catalog())
+        btn_import_servers.pack(pady=5, fill='x', padx=5)
+
         btn_theme_selector = ctk.CTkButton(frame_tools, text="THEME SELECTOR", font=('Roboto Medium', 9, 'bold'), 
                                            fg_color='#800080', hover_color='#4B0082', 
                                            command=lambda: open_theme_selector())
         btn_theme_selector.pack(pady=5, fill='x', padx=5)
 
+        btn_multi_launch = ctk.CTkButton(frame_tools, text="MULTI LAUNCH", font=('Roboto Medium', 9, 'bold'), 
+                                         fg_color='#8B5A00', hover_color='#6B4500', 
+                                         command=lambda: open_multi_launch_window())
+        btn_multi_launch.pack(pady=5, fill='x', padx=5)
+
+        btn_profiles = ctk.CTkButton(frame_tools, text="PROFILES", font=('Roboto Medium', 9, 'bold'), 
+                                     fg_color='#00586B', hover_color='#00414F', 
+                                     command=lambda: open_profiles_window())
+        btn_profiles.pack(pady=5, fill='x', padx=5)
+
         btn_clean_cache = ctk.CTkButton(frame_tools, text="CLEAN CACHE", font=('Roboto Medium', 9, 'bold'), 
                                         fg_color='#5A0000', hover_color='#8B0000', 
                                         command=clean_cache)
         btn_clean_cache.pack(pady=5, fill='x', padx=5)
 
+        btn_trim_cache = ctk.CTkButton(frame_tools, text="TRIM CACHE", font=('Roboto Medium', 9, 'bold'), 
+                                       fg_color='#5A2A00', hover_color='#7A3A00', 
+                                       command=open_trim_cache_window)
+        btn_trim_cache.pack(pady=5, fill='x', padx=5)
+
+        btn_cache_report = ctk.CTkButton(frame_tools, text="CACHE REPORT", font=('Roboto Medium', 9, 'bold'), 
+                                         fg_color='#3A3A5A', hover_color='#4A4A7A', 
+                                         command=open_cache_report_window)
+        btn_cache_report.pack(pady=5, fill='x', padx=5)
+
         # Tool Buttons
-        btn_multirun = ToolButton(frame_tools, "MULTIRUN", "multirun", "multirun", worlds_ini_exists)
+        btn_multirun = ToolButton(frame_tools, "MULTIRUN", "multirun", "multirun", worlds_ini_exists,
+                                   transaction=worlds_changes, on_change=schedule_worlds_commit)
         btn_multirun.pack(pady=5, fill='x', padx=5)
         tool_buttons.append(btn_multirun)
 
-        btn_chatbox = ToolButton(frame_tools, "CHATBOX", "classicchatbox", "classicchatbox", worlds_ini_exists)
+        btn_chatbox = ToolButton(frame_tools, "CHATBOX", "classicchatbox", "classicchatbox", worlds_ini_exists,
+                                   transaction=worlds_changes, on_change=schedule_worlds_commit)
         btn_chatbox.pack(pady=5, fill='x', padx=5)
         tool_buttons.append(btn_chatbox)
 
-        btn_shaper = ToolButton(frame_tools, "SHAPER", "disableshaper", "disableshaper", worlds_ini_exists, default_active=True)
+        btn_shaper = ToolButton(frame_tools, "SHAPER", "disableshaper", "disableshaper", worlds_ini_exists, default_active=True,
+                                   transaction=worlds_changes, on_change=schedule_worlds_commit)
         btn_shaper.pack(pady=5, fill='x', padx=5)
         tool_buttons.append(btn_shaper)
 
-        btn_avatars = ToolButton(frame_tools, "PERMIT ANY AVATARS", "permitanyavatar", "permitAnyAvatar", worlds_ini_exists, font_size=10)
+        btn_avatars = ToolButton(frame_tools, "PERMIT ANY AVATARS", "permitanyavatar", "permitAnyAvatar", worlds_ini_exists, font_size=10,
+                                   transaction=worlds_changes, on_change=schedule_worlds_commit)
         btn_avatars.pack(pady=5, fill='x', padx=5)
         tool_buttons.append(btn_avatars)
 
-        btn_obscenities = ToolButton(frame_tools, "ALLOW OBSCENITIES", "allowobscenities", "allowObscenities", worlds_ini_exists, font_size=10)
+        btn_obscenities = ToolButton(frame_tools, "ALLOW OBSCENITIES", "allowobscenities", "allowObscenities", worlds_ini_exists, font_size=10,
+                                   transaction=worlds_changes, on_change=schedule_worlds_commit)
         btn_obscenities.pack(pady=5, fill='x', padx=5)
         tool_buttons.append(btn_obscenities)
 
@@ -526,12 +658,13 @@ if __name__ == "__main__":
             if not worlds_ini_exists: return
             try:
                 value = int(avatar_value_var.get())
-                if 1 <= value <= 256:
-                    set_avatars_value(value)
-                    avatar_value_var.set(str(get_avatars_value()))
-                    messagebox.showinfo("Success", "Max players view value updated successfully.")
+                if 1 <= value <= MAX_AVATARS:
+                    set_avatars_value(value, worlds_changes)
+                    if flush_worlds_changes():
+                        avatar_value_var.set(str(get_avatars_value()))
+                        messagebox.showinfo("Success", "Max players view value updated successfully.")
                 else:
-                    messagebox.showerror("Invalid Value", "Please enter a number between 1 and 256.")
+                    messagebox.showerror("Invalid Value", f"Please enter a number between 1 and {MAX_AVATARS}.")
             except ValueError:
                 messagebox.showerror("Invalid Input", "Please enter a valid number.")
                 
@@ -560,34 +693,61 @@ if __name__ == "__main__":
         updating_option = tk.StringVar(value="Nothing")
         advanced_view_active = tk.BooleanVar(value=False)
 
+        startup_timer.mark("widget build")
         detected_server = detect_current_server(SERVER_SELECTION_CONFIG)
         server_option.set(detected_server or next(iter(SERVER_SELECTION_CONFIG)))
+        startup_timer.mark("detect_current_server")
+
+        # Server List Frames (the Advanced "Updating Server" pane is only built the first time it is shown)
+        # Both lists are virtualized and searchable: imported catalogs can hold thousands of servers
+        frame_server_selection = ServerListView(server_columns_frame, server_option, "Server Selection", pinned=[AUTO_SERVER_OPTION])
+        frame_updating_server = None
+
+        def populate_updating_server_list():
+            frame_updating_server.set_servers(UPDATING_SERVER_CONFIG)
 
-        # Server List Frames
-        frame_server_selection = ctk.CTkScrollableFrame(server_columns_frame, label_text="Server Selection", label_font=('Roboto Medium', 16, 'bold'))
-        frame_updating_server = ctk.CTkScrollableFrame(server_columns_frame, label_text="Updating Server", label_font=('Roboto Medium', 16, 'bold'))
+        def ensure_updating_server_frame():
+            global frame_updating_server
+            if frame_updating_server is None:
+                frame_updating_server = ServerListView(server_columns_frame, updating_option, "Updating Server", search_text="Search by name...")
+                populate_updating_server_list()
+            return frame_updating_server
 
         def refresh_server_lists():
             global SERVER_SELECTION_CONFIG, UPDATING_SERVER_CONFIG
 
-            # Clear existing
-            for widget in frame_server_selection.winfo_children():
-                widget.destroy()
-            for widget in frame_updating_server.winfo_children():
-                widget.destroy()
-
             new_config = load_full_config()
             if new_config:
                 SERVER_SELECTION_CONFIG = new_config.get("server_selection", {})
                 UPDATING_SERVER_CONFIG = new_config.get("updating_server", {})
 
+                # The rows already on screen are reused; statuses are only drawn for the visible ones
+                frame_server_selection.set_servers(SERVER_SELECTION_CONFIG)
                 for name in SERVER_SELECTION_CONFIG:
-                    ctk.CTkRadioButton(frame_server_selection, text=name, variable=server_option, value=name, font=('Roboto Medium', 14)).pack(anchor='w', pady=3)
+                    show_probe_result(name, server_prober.cached(name))
+                for name in server_prober.set_servers(SERVER_SELECTION_CONFIG):
+                    frame_server_selection.set_status(name, "no host:port")
+
+                if frame_updating_server is not None:
+                    populate_updating_server_list()
 
-                for name in UPDATING_SERVER_CONFIG:
-                    ctk.CTkRadioButton(frame_updating_server, text=name, variable=updating_option, value=name, font=('Roboto Medium', 14)).pack(anchor='w', pady=3)
+        # Reachability of each server, probed off the UI thread and shown next to its radio button
+        latency_history = LatencyHistory(os.path.join(application_path, LATENCY_HISTORY_PATH))
+        server_prober = ServerProber(history=latency_history)
+
+        def show_probe_result(name, result):
+            if result is None:
+                frame_server_selection.set_status(name, "...")
+            else:
+                frame_server_selection.set_status(name, result.status, '#2CC985' if result.reachable else '#C0392B')
+
+        def pump_probe_results():
+            for name, result in server_prober.poll().items():
+                show_probe_result(name, result)
+            window.after(PROBE_PUMP_MS, pump_probe_results)
 
         refresh_server_lists()
+        frame_server_selection.scroll_to(server_option.get())
 
         # Action Buttons (Play / Advanced / Status)
         action_buttons_frame = ctk.CTkFrame(selection_frame, fg_color="transparent")
@@ -595,9 +755,87 @@ if __name__ == "__main__":
         
         launch_button = ctk.CTkButton(action_buttons_frame, text="PLAY", font=('Roboto Medium', 15, 'bold'), 
                                       fg_color='#333333', hover_color='#444444', height=40,
-                                      command=lambda: apply_changes_and_launch(server_option.get(), updating_option.get(), SERVER_SELECTION_CONFIG, UPDATING_SERVER_CONFIG))
+                                      command=lambda: flush_worlds_changes() and with_resolved_server(
+                                          lambda server: apply_changes_and_launch(server, updating_option.get(), SERVER_SELECTION_CONFIG, UPDATING_SERVER_CONFIG)))
         launch_button.pack(side='top', expand=True, fill='x', padx=50)
 
+        # Game Process Status (filled in by the launch manager)
+        launch_status_var = tk.StringVar(value="")
+        label_launch_status = ctk.CTkLabel(action_buttons_frame, textvariable=launch_status_var, font=('Roboto Medium', 10), text_color='gray')
+        label_launch_status.pack(side='top', pady=(5, 0))
+
+        def with_resolved_server(callback):
+            """ Calls callback(server name). "Auto (fastest)" is first resolved by racing a connection to
+            every server on a worker thread, ranked with the latency history so flapping servers lose. """
+            if server_option.get() != AUTO_SERVER_OPTION:
+                callback(server_option.get())
+                return
+            launch_status_var.set("Finding the fastest server...")
+            launch_button.configure(state='disabled')
+            outcome = queue.Queue()
+            candidates = dict(SERVER_SELECTION_CONFIG)
+
+            def race():
+                # Always answers, so the button comes back whatever happens on this thread
+                picked = None
+                try:
+                    picked = pick_fastest_server(candidates, latency_history)
+                except Exception as e:
+                    picked = e
+                finally:
+                    outcome.put(picked)
+
+            threading.Thread(target=race, daemon=True).start()
+
+            def wait_for_race():
+                try:
+                    picked = outcome.get_nowait()
+                except queue.Empty:
+                    window.after(RACE_POLL_MS, wait_for_race)
+                    return
+                launch_button.configure(state='normal')
+                if isinstance(picked, Exception):
+                    launch_status_var.set("")
+                    messagebox.showerror("Unexpected Error", f"Could not test the servers:\n{picked}")
+                    return
+                if picked is None:
+                    launch_status_var.set("")
+                    messagebox.showerror("No Server Reachable", "None of the configured servers answered.")
+                    return
+                name, result = picked
+                launch_status_var.set(f"Fastest server: {name} ({result.status})")
+                callback(name)
+
+            wait_for_race()
+
+        def on_game_exit(game_process):
+            exe_name = os.path.basename(game_process.executable_path)
+            still_running = len(launch_manager.running())
+            launch_status_var.set(f"{exe_name} (PID {game_process.pid}) exited with code {game_process.exit_code} "
+                                  f"after {format_runtime(game_process.runtime)} - {still_running} running")
+
+        def pump_launch_events():
+            launch_manager.dispatch_events()
+            window.after(LAUNCH_POLL_MS, pump_launch_events)
+
+        launch_manager = LaunchManager(on_exit=on_game_exit)
+        pump_launch_events()
+
+        # The game rewrites worlds.ini on its own (RestartAt, LastUpgradeCheck, Shaper layout): the watcher
+        # reports which files changed so only the widgets showing them are refreshed
+        file_watcher = FileWatcher([install.worlds_path, install.override_path, install.server_config_path],
+                                   poll_interval=WATCH_POLL_INTERVAL)
+
+        def pump_file_changes():
+            changed = file_watcher.poll()
+            if os.path.abspath(install.worlds_path) in changed:
+                refresh_worlds_indicators()
+            if os.path.abspath(install.override_path) in changed:
+                refresh_override_indicator()
+            if os.path.abspath(install.server_config_path) in changed:
+                refresh_server_lists()
+            window.after(WATCH_PUMP_MS, pump_file_changes)
+
         # File Status Indicators
         file_indicators_frame = ctk.CTkFrame(action_buttons_frame, fg_color="transparent")
         file_indicators_frame.pack(side='top', pady=10)
@@ -626,7 +864,7 @@ if __name__ == "__main__":
                 advanced_view_active.set(False)
             else:
                 frame_server_selection.grid(row=0, column=0, columnspan=1, sticky='nsew', padx=5)
-                frame_updating_server.grid(row=0, column=1, columnspan=1, sticky='nsew', padx=5)
+                ensure_updating_server_frame().grid(row=0, column=1, columnspan=1, sticky='nsew', padx=5)
                 toggle_button.configure(text="[ Basic ]")
                 advanced_view_active.set(True)
 
@@ -640,8 +878,241 @@ if __name__ == "__main__":
 
         # Add Server Dialog
         def open_theme_selector():
+             from theme_selector_module import ThemeSelectorWindow
              ThemeSelectorWindow(window)
 
+        # Profiles Dialog
+        def current_server_config():
+            return {"server_selection": SERVER_SELECTION_CONFIG, "updating_server": UPDATING_SERVER_CONFIG}
+
+        def open_profiles_window():
+            from profile_module import ProfileStore, apply_profile, capture_profile, installed_theme
+            profile_store = ProfileStore(install.profiles_path)
+            try:
+                names = profile_store.names()
+            except LauncherError as e:
+                messagebox.showerror(e.title, str(e))
+                return
+            profiles_window = ctk.CTkToplevel(window)
+            profiles_window.title("Profiles")
+            profiles_window.geometry("460x240")
+            profiles_window.resizable(False, False)
+            profiles_window.transient(window)
+            profiles_window.after(200, lambda: profiles_window.iconbitmap(resource_path(ICON_NAME)))
+
+            selected_profile = tk.StringVar(value=names[0] if names else "")
+            profile_menu = ctk.CTkOptionMenu(profiles_window, variable=selected_profile, values=names or [""], width=300,
+                                             command=lambda _: show_description())
+            profile_menu.pack(pady=(20, 10))
+            description_label = ctk.CTkLabel(profiles_window, text="", wraplength=400, justify='left',
+                                             font=('Roboto Medium', 11), text_color='gray')
+            description_label.pack(padx=20, fill='x')
+
+            def show_description():
+                profile = profile_store.load().get(selected_profile.get())
+                description_label.configure(text=profile.describe() if profile else "No profiles saved yet.")
+
+            def reload_menu(select=None):
+                names = profile_store.names()
+                profile_menu.configure(values=names or [""])
+                selected_profile.set(select if select in names else (names[0] if names else ""))
+                show_description()
+
+            def apply_selected():
+                name = selected_profile.get()
+                if not name or not flush_worlds_changes():
+                    return
+                try:
+                    profile = profile_store.get(name)
+                    # Only the lines that differ are rewritten, worlds.ini in a single write
+                    changes = apply_profile(install, profile, current_server_config(), *bundled_theme_paths())
+                except LauncherError as e:
+                    messagebox.showerror(e.title, str(e), parent=profiles_window)
+                    return
+                except Exception as e:
+                    messagebox.showerror("Unexpected Error", f"An unexpected error has occurred:\n{e}", parent=profiles_window)
+                    return
+                if profile.server in SERVER_SELECTION_CONFIG:
+                    server_option.set(profile.server)
+                if profile.updating in UPDATING_SERVER_CONFIG:
+                    updating_option.set(profile.updating)
+                refresh_all_indicators()
+                launch_status_var.set(f"Profile '{name}' applied: " + (", ".join(changes) + " rewritten" if changes else "already up to date"))
+
+            def save_current():
+                name = (ctk.CTkInputDialog(text="Profile name:", title="Save Profile").get_input() or "").strip()
+                if not name or not flush_worlds_changes():
+                    return
+                try:
+                    # An "Auto (fastest)" selection is saved as the server currently written to the ini files
+                    server = None if server_option.get() == AUTO_SERVER_OPTION else server_option.get()
+                    profile = capture_profile(install, current_server_config(), server=server, updating=updating_option.get(),
+                                              theme=installed_theme(install, *bundled_theme_paths()))
+                    profile_store.save(name, profile)
+                except LauncherError as e:
+                    messagebox.showerror(e.title, str(e), parent=profiles_window)
+                    return
+                reload_menu(name)
+
+            def delete_selected():
+                name = selected_profile.get()
+                if not name or not messagebox.askyesno("Confirm Deletion", f"Delete profile '{name}'?", parent=profiles_window):
+                    return
+                try:
+                    profile_store.delete(name)
+                except LauncherError as e:
+                    messagebox.showerror(e.title, str(e), parent=profiles_window)
+                reload_menu()
+
+            buttons_frame = ctk.CTkFrame(profiles_window, fg_color="transparent")
+            buttons_frame.pack(side='bottom', pady=20)
+            ctk.CTkButton(buttons_frame, text="Apply", width=110, command=apply_selected).pack(side='left', padx=5)
+            ctk.CTkButton(buttons_frame, text="Save Current...", width=110, command=save_current).pack(side='left', padx=5)
+            ctk.CTkButton(buttons_frame, text="Delete", width=110, fg_color="transparent", border_width=1,
+                          command=delete_selected).pack(side='left', padx=5)
+            show_description()
+
+        # Multi Launch Dialog
+        def open_multi_launch_window():
+            multi_window = ctk.CTkToplevel(window)
+            multi_window.title("Multi Launch")
+            multi_window.geometry("520x480")
+            multi_window.transient(window)
+            multi_window.after(200, lambda: multi_window.iconbitmap(resource_path(ICON_NAME)))
+
+            settings_frame = ctk.CTkFrame(multi_window, fg_color="transparent")
+            settings_frame.pack(fill='x', padx=20, pady=(20, 10))
+
+            fields = {}
+            for column, (label_text, default) in enumerate((("Instances", "4"), ("Stagger (s)", "2"), ("Max running (0 = no cap)", "0"))):
+                ctk.CTkLabel(settings_frame, text=label_text, font=('Roboto Medium', 10)).grid(row=0, column=column, padx=5, sticky='w')
+                entry = ctk.CTkEntry(settings_frame, width=80)
+                entry.insert(0, default)
+                entry.grid(row=1, column=column, padx=5, sticky='w')
+                fields[label_text] = entry
+
+            table_frame = ctk.CTkScrollableFrame(multi_window, label_text="Instances")
+            table_frame.pack(fill='both', expand=True, padx=20, pady=10)
+            for column, heading in enumerate(("#", "PID", "Start latency", "Status")):
+                ctk.CTkLabel(table_frame, text=heading, font=('Roboto Medium', 11, 'bold')).grid(row=0, column=column, padx=8, sticky='w')
+
+            state = {"batch": None, "rows": []}
+
+            def refresh_table():
+                if not multi_window.winfo_exists():
+                    return
+                batch = state["batch"]
+                if batch is None:
+                    return
+                for slot, (_, pid_label, latency_label, status_label) in zip(batch.slots, state["rows"]):
+                    if slot.game_process is not None:
+                        pid_label.configure(text=str(slot.game_process.pid))
+                        latency_label.configure(text=f"{slot.game_process.launch_latency * 1000:.0f} ms")
+                    status_label.configure(text=slot.status)
+                if batch.finished and not any(slot.game_process and slot.game_process.running for slot in batch.slots):
+                    start_button.configure(state='normal')
+                    return
+                multi_window.after(LAUNCH_POLL_MS, refresh_table)
+
+            def start_batch(server=None):
+                if server is None and server_option.get() == AUTO_SERVER_OPTION:
+                    with_resolved_server(start_batch)
+                    return
+                server = server or server_option.get()
+                try:
+                    count = int(fields["Instances"].get())
+                    stagger = float(fields["Stagger (s)"].get())
+                    max_concurrent = int(fields["Max running (0 = no cap)"].get())
+                    if count < 1 or stagger < 0 or max_concurrent < 0:
+                        raise ValueError
+                except ValueError:
+                    messagebox.showerror("Invalid Input", "Please enter a positive number of instances and non-negative stagger and cap values.", parent=multi_window)
+                    return
+                if not worlds_ini_exists or not override_ini_exists:
+                    messagebox.showerror("File Not Found", f"Could not find '{INI_FILE_NAME}' or '{OVERRIDE_FILE_NAME}'. They must be in the same folder as the launcher.", parent=multi_window)
+                    return
+                if not flush_worlds_changes():
+                    return
+                if count > 1 and not check_setting_status("multirun"):
+                    messagebox.showerror("MULTIRUN Disabled", "Enable MULTIRUN before starting more than one client.", parent=multi_window)
+                    return
+                try:
+                    # The ini files are rewritten once for the whole batch
+                    apply_server_changes(server, updating_option.get(), SERVER_SELECTION_CONFIG, UPDATING_SERVER_CONFIG)
+                except Exception as e:
+                    messagebox.showerror("Unexpected Error", f"An unexpected error has occurred:\n{e}", parent=multi_window)
+                    return
+                try:
+                    executable_path = install.require_executable()
+                except LauncherError as e:
+                    messagebox.showerror(e.title, str(e), parent=multi_window)
+                    return
+
+                for row in state["rows"]:
+                    for label in row:
+                        label.destroy()
+                state["rows"] = []
+                batch = MultiLaunch(launch_manager, executable_path, count, stagger, max_concurrent)
+                for slot in batch.slots:
+                    labels = []
+                    for column in (0, 1, 2, 3):
+                        label = ctk.CTkLabel(table_frame, text=str(slot.number) if column == 0 else "-")
+                        label.grid(row=slot.number, column=column, padx=8, sticky='w')
+                        labels.append(label)
+                    state["rows"].append(tuple(labels))
+                state["batch"] = batch
+                start_button.configure(state='disabled')
+                batch.start()
+                refresh_table()
+
+            def cancel_batch():
+                if state["batch"] is not None:
+                    state["batch"].cancel()
+
+            button_frame = ctk.CTkFrame(multi_window, fg_color="transparent")
+            button_frame.pack(pady=10)
+
+            start_button = ctk.CTkButton(button_frame, text="Launch", command=lambda: start_batch())
+            start_button.pack(side='left', padx=10)
+
+            stop_button = ctk.CTkButton(button_frame, text="Stop Launching", command=cancel_batch, fg_color="transparent", border_width=1)
+            stop_button.pack(side='left', padx=10)
+
+        # Server list edits are kept in install.server_config and written in one atomic save once they settle
+        server_save_job = None
+
+        def flush_server_changes():
+            global server_save_job
+            if server_save_job is not None:
+                window.after_cancel(server_save_job)
+                server_save_job = None
+            try:
+                install.server_config.save()
+            except LauncherError as e:
+                messagebox.showerror(e.title, str(e))
+
+        def schedule_server_save():
+            global server_save_job
+            if server_save_job is not None:
+                window.after_cancel(server_save_job)
+            server_save_job = window.after(SERVER_SAVE_DELAY_MS, flush_server_changes)
+
+        def import_server_catalog():
+            from server_catalog_module import import_catalog
+            path = filedialog.askopenfilename(parent=window, title="Import Server Catalog",
+                                              filetypes=[("Server catalogs", "*.json *.csv"), ("All files", "*.*")])
+            if not path:
+                return
+            try:
+                result = import_catalog(install.server_config, path)
+            except LauncherError as e:
+                messagebox.showerror(e.title, str(e))
+                return
+            if result.added:
+                schedule_server_save()
+                refresh_server_lists()
+            messagebox.showinfo("Import Server Catalog", result.summary())
+
         def open_add_server_window():
             add_window = ctk.CTkToplevel(window)
             add_window.title("Add New Server")
@@ -661,8 +1132,8 @@ if __name__ == "__main__":
                     "Server Name": "My Custom Server",
                     "Address Line": lw_server.get("address", "[example.com:12345]"),
                     "WorldServer Line": lw_server.get("world_server", "WorldServer=worldserver://example.com:12345"),
-                    "UpgradeServer (Optional)": lw_updating.get("upgrade_server", "upgradeServer=http://example.com/update"),
-                    "ScriptServer (Optional)": lw_updating.get("script_server", "scriptServer=http://example.com/scripts")
+                    "UpgradeServer (Optional)": lw_updating.get("upgrade_server") or "upgradeServer=http://example.com/update",
+                    "ScriptServer (Optional)": lw_updating.get("script_server") or "scriptServer=http://example.com/scripts"
                 }
             placeholders = get_placeholders()
             
@@ -705,31 +1176,25 @@ if __name__ == "__main__":
                     messagebox.showerror("Error", "Server Name, Address, and WorldServer fields are mandatory.", parent=add_window)
                     return
                     
-                config = load_full_config()
-                if not config: return
-                
-                config["server_selection"][server_name] = {"address": address, "world_server": world_server}
-                updating_data = {}
-                if upgrade_server not in [placeholders["UpgradeServer (Optional)"], ""]:
-                    updating_data["upgrade_server"] = upgrade_server
-                else:
-                    updating_data["upgrade_server"] = None
-                if script_server not in [placeholders["ScriptServer (Optional)"], ""]:
-                    updating_data["script_server"] = script_server
-                else:
-                    updating_data["script_server"] = None
-                    
-                config["updating_server"][server_name] = updating_data
-                
+                if upgrade_server == placeholders["UpgradeServer (Optional)"]:
+                    upgrade_server = None
+                if script_server == placeholders["ScriptServer (Optional)"]:
+                    script_server = None
+
                 try:
-                    server_config_path = os.path.join(application_path, SERVER_CONFIG_FILE)
-                    with open(server_config_path, 'w') as f:
-                        json.dump(config, f, indent=4)
-                    messagebox.showinfo("Success", f"Server '{server_name}' added successfully.", parent=add_window)
-                    add_window.destroy()
-                    refresh_server_lists()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not save configuration file.\n{e}", parent=add_window)
+                    if server_name in SERVER_SELECTION_CONFIG:
+                        if not messagebox.askyesno("Server Exists", f"There is already a server named '{server_name}'.\nReplace it?", parent=add_window):
+                            return
+                        install.server_config.update_server(server_name, address, world_server, upgrade_server, script_server)
+                    else:
+                        install.server_config.add_server(server_name, address, world_server, upgrade_server, script_server)
+                except LauncherError as e:
+                    messagebox.showerror(e.title, str(e), parent=add_window)
+                    return
+                schedule_server_save()
+                messagebox.showinfo("Success", f"Server '{server_name}' added successfully.", parent=add_window)
+                add_window.destroy()
+                refresh_server_lists()
 
             button_frame = ctk.CTkFrame(add_window, fg_color="transparent")
             button_frame.pack(pady=10)
@@ -740,5 +1205,26 @@ if __name__ == "__main__":
             cancel_button = ctk.CTkButton(button_frame, text="Cancel", command=add_window.destroy, fg_color="transparent", border_width=1)
             cancel_button.pack(side='left', padx=10)
 
+        def on_window_close():
+            flush_worlds_changes()
+            flush_server_changes()
+            file_watcher.stop()
+            server_prober.stop()
+            window.destroy()
+
+        window.protocol("WM_DELETE_WINDOW", on_window_close)
+        startup_timer.mark("widget build")
         refresh_all_indicators()
+        startup_timer.mark("indicators")
+        file_watcher.start()
+        window.after(WATCH_PUMP_MS, pump_file_changes)
+        server_prober.start()
+        window.after(PROBE_PUMP_MS, pump_probe_results)
+
+        def report_startup_timing():
+            startup_timer.mark("first draw")
+            print(startup_timer.report())
+
+        if STARTUP_TIMING_ENABLED:
+            window.after_idle(report_startup_timing)
         window.mainloop()
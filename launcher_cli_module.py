@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+import threading
+from worlds_install_module import WorldsInstall, LauncherError, bundled_theme_paths, MAX_AVATARS
+from profile_module import Profile, ProfileStore, apply_profile, capture_profile, installed_theme
+from launch_manager_module import LaunchManager, format_runtime
+from server_probe_module import parse_server_endpoint, probe_endpoints, pick_fastest_server, LatencyHistory, LATENCY_HISTORY_PATH
+from cache_module import CacheCleaner, CACHE_DIR_NAME, format_size
+from server_catalog_module import ServerSearchIndex, import_catalog
+from fleet_module import FleetRunner, FLEET_WORKERS, expand_install_dirs, read_install_list, summarize
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="launcher", description="Apply server and worlds.ini settings and launch the game without the GUI.")
+    parser.add_argument("--install-dir", help="game folder to work on (default: the launcher's folder)")
+    parser.add_argument("--list-servers", action="store_true", help="print the configured servers and the one currently applied")
+    parser.add_argument("--search", metavar="TEXT", help="with --list-servers, only list servers whose name or host contains TEXT")
+    parser.add_argument("--import-catalog", metavar="FILE", help="merge a server catalog (.json or .csv) into the server list, skipping addresses already listed")
+    parser.add_argument("--probe", action="store_true", help="with --list-servers, TCP-probe every server and show its latency")
+    parser.add_argument("--server", help="server to apply, by name from worldsserverselection.json, or 'auto' for the fastest one answering")
+    parser.add_argument("--updating", help="updating server to apply (Nothing, Remove or a name)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="set a [Gamma] key in worlds.ini (repeatable)")
+    parser.add_argument("--avatars", type=int, help=f"number of avatars to load (1-{MAX_AVATARS})")
+    parser.add_argument("--theme", help="theme to install, by folder name under themes")
+    parser.add_argument("--profile", help="apply a saved profile (other options override its fields)")
+    parser.add_argument("--save-profile", metavar="NAME", help="save the install's current configuration as a profile")
+    parser.add_argument("--list-profiles", action="store_true", help="print the saved profiles")
+    parser.add_argument("--fleet", action="append", default=[], metavar="DIR_OR_GLOB", help="apply --server/--updating/--set/--avatars/--theme to every matching install directory (repeatable)")
+    parser.add_argument("--fleet-file", help="text file listing install directories or globs, one per line")
+    parser.add_argument("--workers", type=int, default=FLEET_WORKERS, help=f"installs processed in parallel in fleet mode (default {FLEET_WORKERS})")
+    parser.add_argument("--clean-cache", action="store_true", help="delete everything in cachedir")
+    parser.add_argument("--launch", action="store_true", help="start the game once everything is applied")
+    parser.add_argument("--wait", action="store_true", help="with --launch, wait for the game to exit and return its exit code")
+    parser.add_argument("--startup-timing", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+def parse_assignment(text):
+    key, sep, value = text.partition('=')
+    if not sep or not key.strip():
+        raise LauncherError("Invalid Option", f"--set expects KEY=VALUE, got '{text}'.")
+    return key.strip(), value.strip()
+
+def build_profile(args, install):
+    """ The stored --profile if given, with any explicit option overriding its fields """
+    profile = ProfileStore(install.profiles_path).get(args.profile) if args.profile else Profile()
+    profile = Profile.from_dict(profile.to_dict())
+    if args.server:
+        profile.server = args.server
+    if args.updating:
+        profile.updating = args.updating
+    profile.settings.update(parse_assignment(text) for text in args.set)
+    if args.avatars is not None:
+        profile.avatars = args.avatars
+    if args.theme:
+        profile.theme = args.theme
+    return profile
+
+def resolve_auto_server(profile, server_config, install_path, out):
+    """ Replaces profile.server "auto" with the best-ranked server that answers a connection race """
+    if (profile.server or "").lower() != "auto":
+        return
+    history = LatencyHistory(os.path.join(install_path, LATENCY_HISTORY_PATH))
+    picked = pick_fastest_server(server_config.get("server_selection", {}), history)
+    if picked is None:
+        raise LauncherError("No Server Reachable", "None of the configured servers answered.")
+    profile.server, result = picked
+    print(f"Fastest server: {profile.server} ({result.status})", file=out)
+
+def run_fleet(args, install_path, out=sys.stdout):
+    """ Applies the profile given on the command line to every --fleet/--fleet-file directory.
+    Returns 0 if every install succeeded, 1 otherwise. """
+    if args.launch or args.clean_cache or args.save_profile:
+        raise LauncherError("Invalid Option", "--launch, --clean-cache and --save-profile cannot be combined with fleet mode.")
+    patterns = list(args.fleet)
+    if args.fleet_file:
+        patterns += read_install_list(args.fleet_file)
+    directories = expand_install_dirs(patterns)
+    if not directories:
+        raise LauncherError("No Installs", "No install directory matched the fleet list.")
+    launcher_install = WorldsInstall(install_path)
+    profile = build_profile(args, launcher_install)
+    server_config = launcher_install.load_server_config() if (profile.server or profile.updating) else {}
+    # Raced once for the whole fleet: every install gets the same server
+    resolve_auto_server(profile, server_config, install_path, out)
+    themes_dir, files_list_path = bundled_theme_paths()
+    runner = FleetRunner(directories, profile, server_config, themes_dir=themes_dir, files_list_path=files_list_path, workers=args.workers)
+    print_lock = threading.Lock()
+
+    def print_result(result):
+        # Called from the worker threads
+        with print_lock:
+            print(result.format(), file=out, flush=True)
+
+    started_at = time.perf_counter()
+    results = runner.run(on_result=print_result)
+    print(summarize(results) + f" in {time.perf_counter() - started_at:.2f} s with {runner.workers} workers", file=out)
+    return 1 if any(result.error for result in results) else 0
+
+def run(args, install_path, out=sys.stdout):
+    """ Carries out the parsed options in a fixed order (profile, save, cache, launch).
+    Returns the process exit code; failures raise LauncherError. """
+    if args.fleet or args.fleet_file:
+        return run_fleet(args, install_path, out)
+    install = WorldsInstall(args.install_dir or install_path)
+
+    if args.import_catalog:
+        result = import_catalog(install.server_config, args.import_catalog)
+        install.server_config.save()
+        print(result.summary(), file=out)
+
+    if args.list_servers:
+        config = install.load_server_config()
+        current = install.detect_current_server(config.get("server_selection", {}))
+        server_config_map = config.get("server_selection", {})
+        if args.search:
+            server_config_map = {name: server_config_map[name] for name in ServerSearchIndex(server_config_map).search(args.search)}
+        probes = {}
+        if args.probe:
+            endpoints = {name: parse_server_endpoint(data) for name, data in server_config_map.items()}
+            try:
+                results = asyncio.run(probe_endpoints({e for e in endpoints.values() if e}))
+            except Exception as e:
+                raise LauncherError("Probe Failed", f"Could not test the servers:\n{e!r}")
+            probes = {name: results[e].status if e else "no host:port" for name, e in endpoints.items()}
+        for name in server_config_map:
+            print(f"{'*' if name == current else ' '} {name}" + (f"  [{probes[name]}]" if name in probes else ""), file=out)
+        if not args.search:
+            print("Updating servers: " + ", ".join(config.get("updating_server", {})), file=out)
+
+    if args.list_profiles:
+        for name, profile in ProfileStore(install.profiles_path).load().items():
+            print(f"{name}: {profile.describe()}", file=out)
+
+    profile = build_profile(args, install)
+    if profile.ini_settings() or profile.theme or profile.server or profile.updating:
+        config = install.load_server_config() if (profile.server or profile.updating) else {}
+        resolve_auto_server(profile, config, install.path, out)
+        themes_dir, files_list_path = bundled_theme_paths()
+        changes = apply_profile(install, profile, config, themes_dir, files_list_path)
+        print(f"Applied {profile.describe()}: " + (", ".join(changes) + " rewritten" if changes else "already up to date"), file=out)
+
+    if args.save_profile:
+        config = install.load_server_config()
+        themes_dir, files_list_path = bundled_theme_paths()
+        saved = capture_profile(install, config, theme=installed_theme(install, themes_dir, files_list_path))
+        ProfileStore(install.profiles_path).save(args.save_profile, saved)
+        print(f"Saved profile '{args.save_profile}': {saved.describe()}", file=out)
+
+    if args.clean_cache:
+        cleaner = CacheCleaner(os.path.join(install.path, CACHE_DIR_NAME))
+        if os.path.isdir(cleaner.cache_dir):
+            cleaner.run()
+            if cleaner.error:
+                raise LauncherError("Error", f"Cleaning the cache failed:\n{cleaner.error}")
+            print(f"Cache cleaned: {cleaner.files_deleted} files deleted, {format_size(cleaner.bytes_freed)} reclaimed.", file=out)
+            if cleaner.errors:
+                raise LauncherError("Error", f"{len(cleaner.errors)} cache files or folders could not be deleted, e.g.:\n{cleaner.errors[0][1]}")
+        else:
+            print("Cache folder ('cachedir') not found. Nothing to do.", file=out)
+
+    if args.launch:
+        install.require_ini_files()
+        executable_path = install.require_executable()
+        try:
+            game_process = LaunchManager().launch(executable_path)
+        except OSError as e:
+            raise LauncherError("Launch Failed", f"Could not start '{executable_path}':\n{e}")
+        print(f"Started {os.path.basename(executable_path)} (PID {game_process.pid})", file=out)
+        if args.wait:
+            exit_code = game_process.process.wait()
+            print(f"Game exited with code {exit_code} after {format_runtime(game_process.runtime)}", file=out)
+            return exit_code
+    return 0
+
+def main(argv, install_path):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.avatars is not None and not 1 <= args.avatars <= MAX_AVATARS:
+        parser.error(f"--avatars must be between 1 and {MAX_AVATARS}")
+    try:
+        return run(args, install_path)
+    except LauncherError as e:
+        print(f"{e.title}: {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,164 @@
+import os
+import json
+from ini_document_module import atomic_write_lines, load_ini_document
+from worlds_install_module import LauncherError, PROFILES_FILE, OVERRIDE_FILE_NAME
+from theme_engine_module import ThemeApplyEngine
+
+# [Gamma] keys behind the TOOLS toggle buttons, spelled as they are written to worlds.ini
+GAMMA_TOGGLES = ("multirun", "classicchatbox", "disableshaper", "permitAnyAvatar", "allowObscenities")
+
+class Profile:
+    """ A target configuration: each field left as None is not touched when the profile is applied """
+
+    def __init__(self, server=None, updating=None, settings=None, avatars=None, theme=None):
+        self.server = server
+        self.updating = updating
+        self.settings = dict(settings or {})  # [Gamma] key -> value
+        self.avatars = avatars
+        self.theme = theme
+
+    def ini_settings(self):
+        settings = dict(self.settings)
+        if self.avatars is not None:
+            settings["avatars"] = str(self.avatars)
+        return settings
+
+    def to_dict(self):
+        return {"server": self.server, "updating": self.updating, "settings": self.settings,
+                "avatars": self.avatars, "theme": self.theme}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(server=data.get("server"), updating=data.get("updating"), settings=data.get("settings"),
+                   avatars=data.get("avatars"), theme=data.get("theme"))
+
+    def describe(self):
+        parts = []
+        if self.server:
+            parts.append(f"server {self.server}")
+        if self.updating:
+            parts.append(f"updating {self.updating}")
+        parts += [f"{key}={value}" for key, value in self.ini_settings().items()]
+        if self.theme:
+            parts.append(f"theme {self.theme}")
+        return ", ".join(parts) or "empty"
+
+class ProfileStore:
+    """ Named profiles kept in worldsprofiles.json next to the server list, re-read only when it changes """
+
+    def __init__(self, path):
+        self.path = path
+        self.signature = None
+        self.profiles = {}
+
+    def load(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self.signature, self.profiles = None, {}
+            return self.profiles
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature != self.signature:
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                raise LauncherError("Error", f"Could not read '{PROFILES_FILE}'.\nError: {e}")
+            self.profiles = {name: Profile.from_dict(entry) for name, entry in data.get("profiles", {}).items()}
+            self.signature = signature
+        return self.profiles
+
+    def names(self):
+        return list(self.load())
+
+    def get(self, name):
+        profile = self.load().get(name)
+        if profile is None:
+            raise LauncherError("Unknown Profile", f"There is no profile named '{name}'.")
+        return profile
+
+    def save(self, name, profile):
+        profiles = dict(self.load())
+        profiles[name] = profile
+        self.write(profiles)
+
+    def delete(self, name):
+        profiles = dict(self.load())
+        if profiles.pop(name, None) is not None:
+            self.write(profiles)
+
+    def write(self, profiles):
+        text = json.dumps({"profiles": {name: profile.to_dict() for name, profile in profiles.items()}}, indent=4)
+        try:
+            atomic_write_lines(self.path, [text])
+        except OSError as e:
+            raise LauncherError("Error", f"Could not save '{PROFILES_FILE}'.\nError: {e}")
+        self.profiles = profiles
+        st = os.stat(self.path)
+        self.signature = (st.st_mtime_ns, st.st_size)
+
+def capture_profile(install, server_config, server=None, updating=None, theme=None, transaction=None):
+    """ Profile of the install's current state. server/updating default to what the ini files show,
+    and values staged in transaction win over the ones already in worlds.ini. """
+    settings = {}
+    avatars = None
+    try:
+        document = load_ini_document(install.worlds_path)
+    except FileNotFoundError:
+        document = None
+    for key in GAMMA_TOGGLES + ("avatars",):
+        value = transaction.get(key) if transaction is not None else None
+        if value is None and document is not None:
+            value = document.get(key)
+        if value is None:
+            continue
+        if key == "avatars":
+            avatars = int(value) if value.isdigit() else None
+        else:
+            settings[key] = value
+    if server is None:
+        server_config_map = server_config.get("server_selection", {})
+        server = install.detect_current_server(server_config_map) or install.detect_world_server(server_config_map)
+    if updating is None or updating == "Nothing":
+        updating = install.detect_updating_server(server_config.get("updating_server", {}))
+    return Profile(server=server, updating=updating, settings=settings, avatars=avatars, theme=theme)
+
+def installed_theme(install, themes_dir, files_list_path):
+    """ Theme last applied to the install by the launcher, or None """
+    return ThemeApplyEngine(themes_dir, install.path, files_list_path).current_theme
+
+def apply_profile(install, profile, server_config, themes_dir=None, files_list_path=None):
+    """ Brings the install to profile, writing each file at most once and only where it differs.
+    Returns what was rewritten ("theme (N files)", "settings", "server" or "ini files" for both); raises LauncherError. """
+    changes = []
+    settings = profile.ini_settings()
+    if profile.server or profile.updating:
+        install.require_ini_files()
+    if profile.theme:
+        # The theme goes first: its override.ini has no WorldServer line, the server step puts it back
+        if not os.path.isdir(os.path.join(themes_dir or "", profile.theme)):
+            raise LauncherError("Unknown Theme", f"Theme '{profile.theme}' was not found in '{themes_dir}'.")
+        engine = ThemeApplyEngine(themes_dir, install.path, files_list_path)
+        theme_plan = engine.plan(profile.theme)
+        if engine.current_theme == profile.theme and (profile.server or profile.updating):
+            # That WorldServer difference is expected once the theme is installed and must not trigger a recopy
+            theme_plan.to_copy = [entry for entry in theme_plan.to_copy if entry[0].lower() != OVERRIDE_FILE_NAME.lower()]
+        if theme_plan.to_copy:
+            theme_result = engine.apply(profile.theme, plan=theme_plan, max_workers=1)
+            if theme_result.failed:
+                raise LauncherError("Error", f"{len(theme_result.failed)} theme files could not be copied: " + ", ".join(name for name, _ in theme_result.failed[:5]))
+            changes.append(f"theme ({len(theme_result.copied)} files)")
+    if profile.server or profile.updating:
+        server_config_map = server_config.get("server_selection", {})
+        server = profile.server or install.detect_current_server(server_config_map)
+        if server is None:
+            raise LauncherError("Unknown Server", "The current server could not be detected to apply the updating server to.")
+        if install.apply_server_changes(server, profile.updating, server_config_map, server_config.get("updating_server", {}), settings=settings):
+            changes.append("ini files" if settings else "server")
+    elif settings:
+        transaction = install.transaction()
+        for key, value in settings.items():
+            transaction.set(key, value)
+        if install.commit(transaction):
+            changes.append("settings")
+    return changes
@@ -0,0 +1,150 @@
+import os
+import re
+import csv
+import json
+import bisect
+from worlds_install_module import LauncherError
+from server_config_module import ServerConfig, ServerEntry, UpdatingEntry, RESERVED_UPDATING_OPTIONS, parse_address
+
+CATALOG_FIELDS = ("name", "address", "world_server", "upgrade_server", "script_server")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+def read_catalog(path):
+    """ Server entries of a catalog file as dicts with CATALOG_FIELDS keys. Accepts a
+    worldsserverselection.json-style file, a JSON list of entries (or {"servers": [...]}),
+    or a CSV file with a header row naming the fields. Entries of a server list that cannot be read
+    get an "error" key instead, for merge_catalog to report. Raises LauncherError. """
+    try:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            if os.path.splitext(path)[1].lower() == ".csv":
+                return [{field: (row.get(field) or None) for field in CATALOG_FIELDS} for row in csv.DictReader(f)]
+            data = json.load(f)
+    except (OSError, ValueError, csv.Error) as e:
+        raise LauncherError("Invalid Catalog", f"Could not read '{os.path.basename(path)}'.\nError: {e}")
+    if isinstance(data, dict) and isinstance(data.get("server_selection"), dict):
+        updating = data.get("updating_server")
+        updating = updating if isinstance(updating, dict) else {}
+        entries = []
+        for name, entry in data["server_selection"].items():
+            extra = updating.get(name) or {}
+            if not isinstance(entry, dict):
+                entries.append({"name": name, "error": "its server entry is not an object."})
+            elif not isinstance(extra, dict):
+                entries.append({"name": name, "error": "its updating server entry is not an object."})
+            else:
+                entries.append({"name": name, **entry, **extra})
+        return entries
+    if isinstance(data, dict):
+        data = data.get("servers")
+    if not isinstance(data, list) or not all(isinstance(entry, dict) for entry in data):
+        raise LauncherError("Invalid Catalog", f"'{os.path.basename(path)}' is neither a server list nor a list of servers.")
+    return data
+
+class CatalogImportResult:
+    def __init__(self):
+        self.added = []
+        self.renamed = []  # (name in the catalog, name it was added as)
+        self.duplicates = 0  # entries whose address is already listed
+        self.invalid = []  # (name, reason)
+
+    def summary(self):
+        msg = f"{len(self.added)} servers added, {self.duplicates} already listed (same address)."
+        if self.renamed:
+            msg += f"\n{len(self.renamed)} renamed because the name was taken, e.g. '{self.renamed[0][0]}' -> '{self.renamed[0][1]}'."
+        if self.invalid:
+            msg += f"\n{len(self.invalid)} skipped as invalid, e.g. '{self.invalid[0][0]}': {self.invalid[0][1]}"
+        return msg
+
+def merge_catalog(config, entries):
+    """ (ServerConfig, CatalogImportResult): config plus every entry whose address is not listed yet.
+    Addresses are compared case-insensitively, within the catalog too; clashing names get a " (2)" suffix.
+    Entries without a name, address and world_server, or whose address is not a valid host:port, are listed in invalid. """
+    result = CatalogImportResult()
+    servers, updating = dict(config.servers), dict(config.updating)
+    addresses = {entry.address.lower() for entry in servers.values()}
+    for raw in entries:
+        name = str(raw.get("name") or "").strip()
+        try:
+            if not name or name in RESERVED_UPDATING_OPTIONS:
+                raise LauncherError("Invalid Catalog", "no usable name.")
+            if raw.get("error"):
+                raise LauncherError("Invalid Catalog", raw["error"])
+            server = ServerEntry.parse(name, raw)
+            updating_entry = UpdatingEntry.parse(name, raw)
+            if parse_address(server.address) is None:
+                raise LauncherError("Invalid Catalog", f"'{server.address}' is not a valid [host:port] address (port 1-65535).")
+        except LauncherError as e:
+            result.invalid.append((name or "?", str(e)))
+            continue
+        if server.address.lower() in addresses:
+            result.duplicates += 1
+            continue
+        unique_name, n = name, 2
+        while unique_name in servers or unique_name in updating:
+            unique_name, n = f"{name} ({n})", n + 1
+        if unique_name != name:
+            result.renamed.append((name, unique_name))
+            server.name = updating_entry.name = unique_name
+        addresses.add(server.address.lower())
+        servers[unique_name] = server
+        # Only entries with their own upgrade/script servers are offered as updating servers
+        if updating_entry.upgrade_server or updating_entry.script_server:
+            updating[unique_name] = updating_entry
+        result.added.append(unique_name)
+    return ServerConfig(servers, updating), result
+
+def import_catalog(store, path):
+    """ Merges a catalog file into a ServerConfigStore (saving is left to the caller). Returns the CatalogImportResult. """
+    config, result = merge_catalog(store.load(), read_catalog(path))
+    if result.added:
+        store.replace(config)
+    return result
+
+class ServerSearchIndex:
+    """ Prefix and substring search over server names and hosts.
+
+    Prefixes are answered by bisecting a sorted list of name/host/word tokens; substrings of three
+    characters or more by intersecting trigram postings before confirming each candidate, so a
+    keystroke in the search box stays cheap with thousands of servers. Results keep list order,
+    prefix matches first. """
+
+    def __init__(self, server_config_map):
+        self.names = list(server_config_map)
+        self.haystacks = []
+        tokens = []
+        self.trigrams = {}
+        for i, (name, server_data) in enumerate(server_config_map.items()):
+            host = (server_data.get("address") or "").strip().strip("[]").lower()
+            haystack = f"{name.lower()}\n{host}"
+            self.haystacks.append(haystack)
+            for token in {name.lower(), host, host.split(':')[0], *_WORD_PATTERN.findall(name.lower())}:
+                if token:
+                    tokens.append((token, i))
+            for j in range(len(haystack) - 2):
+                self.trigrams.setdefault(haystack[j:j + 3], set()).add(i)
+        tokens.sort()
+        self.tokens = tokens
+
+    def prefix_matches(self, query):
+        matches = set()
+        for token, i in self.tokens[bisect.bisect_left(self.tokens, (query,)):]:
+            if not token.startswith(query):
+                break
+            matches.add(i)
+        return matches
+
+    def substring_matches(self, query):
+        if len(query) < 3:
+            return {i for i, haystack in enumerate(self.haystacks) if query in haystack}
+        postings = sorted((self.trigrams.get(query[j:j + 3], set()) for j in range(len(query) - 2)), key=len)
+        candidates = set.intersection(*postings) if postings[0] else set()
+        return {i for i in candidates if query in self.haystacks[i]}
+
+    def search(self, query):
+        """ Names matching query (case-insensitive), or every name for an empty query """
+        query = query.strip().lower()
+        if not query:
+            return list(self.names)
+        prefixed = self.prefix_matches(query)
+        others = self.substring_matches(query) - prefixed
+        return [self.names[i] for i in sorted(prefixed)] + [self.names[i] for i in sorted(others)]
@@ -0,0 +1,182 @@
+import os
+import re
+import json
+from ini_document_module import atomic_write_lines
+from worlds_install_module import LauncherError, SERVER_CONFIG_FILE, DEFAULT_SERVER_CONFIG
+
+# Updating server choices handled by the launcher itself rather than read from an entry
+RESERVED_UPDATING_OPTIONS = ("Nothing", "Remove")
+_LABEL_PATTERN = re.compile(r"[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?")
+
+def valid_host(host):
+    """ True for a host name or IPv4 address the resolver can be asked about (1-63 character labels,
+    no empty label, at most 253 characters) """
+    host = host.lower().rstrip('.')
+    return 0 < len(host) <= 253 and all(_LABEL_PATTERN.fullmatch(label) for label in host.split('.'))
+
+def parse_address(address):
+    """ (host, port) of an "[host:port]" address, or None unless both are valid (port 1-65535) """
+    host, _, port = address.strip().strip('[]').rpartition(':')
+    if not (port.isdigit() and 0 < int(port) < 65536 and valid_host(host)):
+        return None
+    return host.lower(), int(port)
+
+def _invalid(message):
+    return LauncherError("Invalid Server List", message)
+
+def _text(value, field, name, required):
+    """ value stripped, None for an empty optional field; raises LauncherError for anything but a string """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise _invalid(f"server '{name}' has no {field}.")
+        return None
+    if not isinstance(value, str):
+        raise _invalid(f"{field} of '{name}' must be text.")
+    return value.strip()
+
+class ServerEntry:
+    __slots__ = ("name", "address", "world_server")
+
+    def __init__(self, name, address, world_server):
+        self.name = name
+        self.address = address  # "[host:port]", the worlds.ini section of the old client
+        self.world_server = world_server  # "WorldServer=..." line of override.ini
+
+    @classmethod
+    def parse(cls, name, data):
+        if not isinstance(data, dict):
+            raise _invalid(f"server '{name}' must be an object.")
+        address = _text(data.get("address"), "address", name, required=True)
+        world_server = _text(data.get("world_server"), "world_server", name, required=True)
+        if not (address.startswith('[') and address.endswith(']')):
+            address = f"[{address.strip('[]')}]"
+        if '=' not in world_server:
+            world_server = f"WorldServer={world_server}"
+        return cls(name, address, world_server)
+
+    def to_dict(self):
+        return {"address": self.address, "world_server": self.world_server}
+
+class UpdatingEntry:
+    __slots__ = ("name", "upgrade_server", "script_server")
+
+    def __init__(self, name, upgrade_server=None, script_server=None):
+        self.name = name
+        self.upgrade_server = upgrade_server  # "upgradeServer=..." line, or None to leave it out
+        self.script_server = script_server
+
+    @classmethod
+    def parse(cls, name, data):
+        if not isinstance(data, dict):
+            raise _invalid(f"updating server '{name}' must be an object.")
+        return cls(name, _text(data.get("upgrade_server"), "upgrade_server", name, required=False),
+                   _text(data.get("script_server"), "script_server", name, required=False))
+
+    def to_dict(self):
+        if self.name in RESERVED_UPDATING_OPTIONS:
+            return {}
+        return {"upgrade_server": self.upgrade_server, "script_server": self.script_server}
+
+class ServerConfig:
+    """ Validated snapshot of the server list. Snapshots are never modified: every change makes a new
+    one, so the maps from as_dict() can be shared and cached by identity (see ServerIndex). """
+
+    def __init__(self, servers, updating):
+        self.servers = servers  # name -> ServerEntry, in file order
+        self.updating = updating  # name -> UpdatingEntry, in file order
+        self._dict = None
+
+    @classmethod
+    def parse(cls, data):
+        if not isinstance(data, dict) or not isinstance(data.get("server_selection"), dict):
+            raise _invalid("it needs a \"server_selection\" object.")
+        updating = data.get("updating_server", {})
+        if not isinstance(updating, dict):
+            raise _invalid("\"updating_server\" must be an object.")
+        return cls({name: ServerEntry.parse(name, entry) for name, entry in data["server_selection"].items()},
+                   {name: UpdatingEntry.parse(name, entry) for name, entry in updating.items()})
+
+    def as_dict(self):
+        """ The {"server_selection": ..., "updating_server": ...} maps the rest of the launcher reads (built once) """
+        if self._dict is None:
+            self._dict = {"server_selection": {name: entry.to_dict() for name, entry in self.servers.items()},
+                          "updating_server": {name: entry.to_dict() for name, entry in self.updating.items()}}
+        return self._dict
+
+class ServerConfigStore:
+    """ worldsserverselection.json, parsed and validated once per change of its mtime/size.
+
+    add_server/update_server/remove_server edit the in-memory list and mark it dirty; save() writes
+    it atomically. Callers debounce save() (the GUI does it on a timer) so a burst of edits is one
+    write. While edits are pending, the file is not re-read over them. """
+
+    def __init__(self, path):
+        self.path = path
+        self.signature = None
+        self.config = None
+        self.dirty = False
+
+    def load(self):
+        """ The current ServerConfig, creating the default list first if the file does not exist """
+        if self.dirty:
+            return self.config
+        try:
+            if not os.path.isfile(self.path):
+                atomic_write_lines(self.path, [json.dumps(DEFAULT_SERVER_CONFIG, indent=4)])
+            st = os.stat(self.path)
+            signature = (st.st_mtime_ns, st.st_size)
+            if signature == self.signature:
+                return self.config
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise LauncherError("Critical Error", f"Could not create or read '{SERVER_CONFIG_FILE}'.\nError: {e}")
+        try:
+            self.config = ServerConfig.parse(data)
+        except LauncherError as e:
+            raise LauncherError(e.title, f"'{SERVER_CONFIG_FILE}' is not valid: {e}")
+        self.signature = signature
+        return self.config
+
+    def save(self):
+        """ Writes pending edits, if any. Returns True if the file was written. """
+        if not self.dirty:
+            return False
+        try:
+            atomic_write_lines(self.path, [json.dumps(self.config.as_dict(), indent=4)])
+        except OSError as e:
+            raise LauncherError("Error", f"Could not save configuration file.\n{e}")
+        st = os.stat(self.path)
+        self.signature = (st.st_mtime_ns, st.st_size)
+        self.dirty = False
+        return True
+
+    # --- Edits ---
+    def add_server(self, name, address, world_server, upgrade_server=None, script_server=None):
+        """ Adds a server and its updating server entry. Raises LauncherError if the name is taken. """
+        if name in self.load().servers:
+            raise LauncherError("Server Exists", f"There is already a server named '{name}'.")
+        self.update_server(name, address, world_server, upgrade_server, script_server)
+
+    def update_server(self, name, address, world_server, upgrade_server=None, script_server=None):
+        """ Adds or replaces a server and its updating server entry """
+        name = (name or "").strip()
+        if not name or name in RESERVED_UPDATING_OPTIONS:
+            raise LauncherError("Error", f"'{name}' cannot be used as a server name.")
+        server = ServerEntry.parse(name, {"address": address, "world_server": world_server})
+        updating = UpdatingEntry.parse(name, {"upgrade_server": upgrade_server, "script_server": script_server})
+        config = self.load()
+        self.replace(ServerConfig({**config.servers, name: server}, {**config.updating, name: updating}))
+
+    def remove_server(self, name):
+        """ Removes a server and its updating server entry; unknown names are ignored """
+        config = self.load()
+        if name not in config.servers:
+            return
+        servers = {key: entry for key, entry in config.servers.items() if key != name}
+        updating = {key: entry for key, entry in config.updating.items() if key != name or key in RESERVED_UPDATING_OPTIONS}
+        self.replace(ServerConfig(servers, updating))
+
+    def replace(self, config):
+        self.config = config
+        self.dirty = True
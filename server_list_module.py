@@ -0,0 +1,104 @@
+import customtkinter as ctk
+from server_catalog_module import ServerSearchIndex
+from virtual_list_module import VirtualRowList
+
+SERVER_ROW_HEIGHT = 32  # 26px radio button + 3px padding above and below
+STATUS_COLOR = 'gray'
+
+class ServerListView(VirtualRowList, ctk.CTkFrame):
+    """ Searchable radio-button list bound to a StringVar, virtualized like the theme selector (VirtualRowList):
+    only as many rows as fit on screen exist and they are recycled while scrolling, so a catalog
+    of thousands of servers costs the same to show, search and refresh as a handful.
+
+    pinned options (e.g. "Auto (fastest)") are always listed first, whatever the search.
+    set_servers() swaps the list in place and set_status() only touches a row if it is visible. """
+
+    row_height = SERVER_ROW_HEIGHT
+    row_padding = 3
+
+    def __init__(self, parent, variable, title, pinned=(), search_text="Search by name or host..."):
+        super().__init__(parent)
+        self.variable = variable
+        self.pinned = list(pinned)
+        self.server_map = None
+        self.search_index = ServerSearchIndex({})
+        self.names = list(self.pinned)  # What the rows show: pinned options, then the matching servers
+        self.statuses = {}  # name -> (text, color)
+        self.first_index = 0  # Index in names of the top visible row
+        self.rows = []  # Recycled pool of (frame, radio button, status label)
+        self.visible_rows = {}  # name -> (frame, radio button, status label) currently showing it
+
+        ctk.CTkLabel(self, text=title, font=('Roboto Medium', 16, 'bold')).pack(pady=(5, 0))
+        self.entry_search = ctk.CTkEntry(self, placeholder_text=search_text)
+        self.entry_search.pack(fill='x', padx=10, pady=5)
+        self.entry_search.bind("<KeyRelease>", lambda event: self.apply_search())
+
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill='both', expand=True, padx=(10, 0), pady=(0, 5))
+        self.scrollbar = ctk.CTkScrollbar(body, command=self.on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
+        self.rows_frame = ctk.CTkFrame(body, fg_color="transparent")
+        self.rows_frame.pack(side='left', fill='both', expand=True)
+        self.rows_frame.bind("<Configure>", self.on_list_resize)
+        self.bind_wheel(self.rows_frame)
+
+    def bind_wheel(self, widget):
+        # Windows/macOS and X11 mouse wheel events
+        widget.bind("<MouseWheel>", lambda event: self.scroll_rows(-1 if event.delta > 0 else 1), add="+")
+        widget.bind("<Button-4>", lambda event: self.scroll_rows(-1), add="+")
+        widget.bind("<Button-5>", lambda event: self.scroll_rows(1), add="+")
+
+    # --- Content ---
+    def set_servers(self, server_config_map):
+        """ Shows server_config_map ({name: {"address": ...}}); the search index is only rebuilt for a new map """
+        if server_config_map is not self.server_map:
+            self.server_map = server_config_map
+            self.search_index = ServerSearchIndex(server_config_map)
+            self.statuses = {name: status for name, status in self.statuses.items() if name in server_config_map}
+        self.apply_search(keep_position=True)
+
+    def set_status(self, name, text, color=STATUS_COLOR):
+        self.statuses[name] = (text, color)
+        row = self.visible_rows.get(name)
+        if row is not None:
+            row[2].configure(text=text, text_color=color)
+
+    def apply_search(self, keep_position=False):
+        self.names = self.pinned + self.search_index.search(self.entry_search.get())
+        if not keep_position:
+            self.first_index = 0
+        self.render_rows()
+
+    def scroll_to(self, name):
+        """ Scrolls just enough for name's row to be visible """
+        if name not in self.names:
+            return
+        index = self.names.index(name)
+        if index < self.first_index:
+            self.first_index = index
+        elif index >= self.first_index + self.visible_row_count():
+            self.first_index = index - self.visible_row_count() + 1
+        self.render_rows()
+
+    # --- Rows ---
+    def row_items(self):
+        return self.names
+
+    def create_row(self):
+        frame = ctk.CTkFrame(self.rows_frame, fg_color="transparent", height=SERVER_ROW_HEIGHT - 6)
+        radio = ctk.CTkRadioButton(frame, text="", variable=self.variable, value="", font=('Roboto Medium', 14))
+        radio.pack(side='left')
+        label = ctk.CTkLabel(frame, text="", font=('Roboto Medium', 11), text_color=STATUS_COLOR)
+        label.pack(side='right', padx=10)
+        for widget in (frame, radio, label):
+            self.bind_wheel(widget)
+        return frame, radio, label
+
+    def row_widget(self, row):
+        return row[0]
+
+    def show_row(self, row, name):
+        _, radio, label = row
+        radio.configure(text=name, value=name)
+        text, color = self.statuses.get(name, ("", STATUS_COLOR))
+        label.configure(text=text, text_color=color)
@@ -0,0 +1,282 @@
+import os
+import re
+import json
+import time
+import queue
+import asyncio
+import threading
+from ini_document_module import atomic_write_lines
+from server_config_module import valid_host
+
+PROBE_TIMEOUT = 2.0
+PROBE_CONCURRENCY = 64
+# The PLAY race has a deadline, so it opens more connections at once than the background refresh
+PROBE_RACE_CONCURRENCY = 256
+PROBE_REFRESH_INTERVAL = 60.0
+AUTO_SERVER_OPTION = "Auto (fastest)"
+LATENCY_HISTORY_PATH = os.path.join("launcher_cache", "server_latency.json")
+LATENCY_HISTORY_SIZE = 20
+# How much a server that failed or flipped state on every sample is slowed down in the ranking (score x 3)
+FLAP_PENALTY = 2.0
+
+# host:port as it appears in "[test.libreworlds.org:32147]" or "WorldServer=worldserver://worlio.com:6650/"
+_ENDPOINT_PATTERN = re.compile(r"([A-Za-z0-9][A-Za-z0-9.\-]*):(\d{1,5})")
+
+def parse_server_endpoint(server_data):
+    """ (host, port) of a server_selection entry, from its address line or else its world_server
+    line, or None if neither names a valid host:port """
+    for field in ("address", "world_server"):
+        match = _ENDPOINT_PATTERN.search(server_data.get(field) or "")
+        if match and 0 < int(match.group(2)) < 65536 and valid_host(match.group(1)):
+            return match.group(1).lower(), int(match.group(2))
+    return None
+
+class ProbeResult:
+    def __init__(self, endpoint, reachable, rtt=None, error=None, checked_at=None):
+        self.endpoint = endpoint
+        self.reachable = reachable
+        self.rtt = rtt  # seconds to complete the TCP handshake
+        self.error = error
+        self.checked_at = checked_at if checked_at is not None else time.monotonic()
+
+    @property
+    def status(self):
+        if self.reachable:
+            return f"{self.rtt * 1000:.0f} ms"
+        return self.error or "down"
+
+async def probe_endpoint(host, port, timeout=PROBE_TIMEOUT):
+    """ Times a TCP connect to host:port; the connection is closed as soon as it is established """
+    started_at = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except asyncio.TimeoutError:
+        return ProbeResult((host, port), False, error="timeout")
+    except OSError as e:
+        return ProbeResult((host, port), False, error="refused" if isinstance(e, ConnectionRefusedError) else "unreachable")
+    except (UnicodeError, ValueError):
+        # getaddrinfo rejects names it cannot encode (empty or over-long labels)
+        return ProbeResult((host, port), False, error="bad host")
+    rtt = time.perf_counter() - started_at
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return ProbeResult((host, port), True, rtt=rtt)
+
+async def probe_endpoints(endpoints, timeout=PROBE_TIMEOUT, concurrency=PROBE_CONCURRENCY):
+    """ Probes every (host, port) concurrently, at most concurrency at a time. Returns {endpoint: ProbeResult}. """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def probe(endpoint):
+        async with limit:
+            return await probe_endpoint(endpoint[0], endpoint[1], timeout)
+
+    results = await asyncio.gather(*(probe(endpoint) for endpoint in endpoints))
+    return {result.endpoint: result for result in results}
+
+async def race_endpoints(endpoints, score, timeout=PROBE_TIMEOUT, concurrency=PROBE_RACE_CONCURRENCY):
+    """ Probes every (host, port) like probe_endpoints, but returns as soon as no probe still running
+    can beat the best reachable one, and in any case once timeout seconds have passed overall.
+    Endpoints get a connection slot in order of score(endpoint, timeout), the score of an answer at
+    the deadline: servers with a good history first, then unknown ones, then flapping ones, so with
+    more endpoints than concurrency the likely winners are the ones probed before the deadline.
+    score(endpoint, rtt) ranks an answer (lower is better) and must not decrease as rtt grows, so
+    score(endpoint, seconds waited so far) bounds what a pending probe can still reach. Probes still
+    pending are cancelled. Returns {endpoint: ProbeResult} of the probes that finished. """
+    limit = asyncio.Semaphore(concurrency)
+    started = {}  # endpoint -> perf_counter() when its probe got a slot
+
+    async def probe(endpoint):
+        async with limit:
+            started[endpoint] = time.perf_counter()
+            return await probe_endpoint(endpoint[0], endpoint[1], timeout)
+
+    tasks = {asyncio.ensure_future(probe(endpoint)): endpoint for endpoint in sorted(endpoints, key=lambda endpoint: (score(endpoint, timeout), endpoint))}
+    pending, results, best = set(tasks), {}, None
+    deadline = time.perf_counter() + timeout
+    try:
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                results[result.endpoint] = result
+                if result.reachable:
+                    best = min(score(result.endpoint, result.rtt), best if best is not None else float("inf"))
+            if best is not None:
+                now = time.perf_counter()
+                if all(score(tasks[task], now - started.get(tasks[task], now)) >= best for task in pending):
+                    break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return results
+
+class LatencyHistory:
+    """ The last LATENCY_HISTORY_SIZE probe outcomes per host:port (RTT in seconds, None for a failure),
+    kept on disk so the ranking remembers servers that keep dropping out between sessions """
+
+    def __init__(self, path=None, size=LATENCY_HISTORY_SIZE):
+        self.path = path
+        self.size = size
+        self.lock = threading.Lock()
+        self.samples = {}  # "host:port" -> list of RTTs / None, oldest first
+        if path:
+            try:
+                with open(path, 'r') as f:
+                    self.samples = {key: list(values)[-size:] for key, values in json.load(f).items()}
+            except (OSError, ValueError, AttributeError):
+                self.samples = {}
+
+    @staticmethod
+    def key(endpoint):
+        return f"{endpoint[0]}:{endpoint[1]}"
+
+    def record(self, result):
+        with self.lock:
+            samples = self.samples.setdefault(self.key(result.endpoint), [])
+            samples.append(result.rtt if result.reachable else None)
+            del samples[:-self.size]
+
+    def score(self, endpoint, rtt):
+        """ Ranking value for a server that just answered in rtt seconds: its RTT blended with its
+        median history, scaled up by how often it failed or changed state. Lower is better. """
+        with self.lock:
+            samples = list(self.samples.get(self.key(endpoint), []))
+        successes = sorted(sample for sample in samples if sample is not None)
+        typical = successes[len(successes) // 2] if successes else rtt
+        failures = len(samples) - len(successes)
+        transitions = sum(1 for a, b in zip(samples, samples[1:]) if (a is None) != (b is None))
+        instability = min(1.0, (failures + transitions) / len(samples)) if samples else 0.0
+        return (rtt + typical) / 2 * (1 + FLAP_PENALTY * instability)
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            text = json.dumps(self.samples)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            atomic_write_lines(self.path, [text])
+        except OSError as e:
+            print(f"Could not save latency history {self.path}: {e}")
+
+def pick_fastest_server(server_config_map, history=None, timeout=PROBE_TIMEOUT):
+    """ Races a TCP connect to every server and returns (name, ProbeResult) of the best-scoring one
+    that answered, or None if none did. Returns as soon as no slower probe can still win, and after
+    about timeout seconds at most, however many servers there are: call it off the UI thread.
+    Only the probes that finished are recorded in history. """
+    endpoints = {name: parse_server_endpoint(data) for name, data in server_config_map.items()}
+    endpoints = {name: endpoint for name, endpoint in endpoints.items() if endpoint}
+    if not endpoints:
+        return None
+    # Scores are computed against the history as it was before this race
+    score = history.score if history else (lambda endpoint, rtt: rtt)
+    results = asyncio.run(race_endpoints(set(endpoints.values()), score, timeout))
+    ranking = []
+    for name, endpoint in endpoints.items():
+        result = results.get(endpoint)
+        if result is not None and result.reachable:
+            ranking.append((score(endpoint, result.rtt), name, result))
+    if history:
+        for result in results.values():
+            history.record(result)
+        history.save()
+    if not ranking:
+        return None
+    _, name, result = min(ranking, key=lambda entry: entry[0])
+    return name, result
+
+class ServerProber:
+    """ Keeps the reachability of the configured servers fresh from a daemon thread.
+
+    Every refresh_interval seconds (or at once after set_servers/refresh) all endpoints are probed
+    concurrently on an asyncio loop owned by the thread. Results are cached per host:port, so
+    servers sharing an endpoint are probed once, and queued as {server name: ProbeResult} for the
+    Tk loop to collect with poll(). Nothing here ever runs on the caller's thread. Every round
+    is also recorded in history, if given, for pick_fastest_server's ranking. """
+
+    def __init__(self, timeout=PROBE_TIMEOUT, refresh_interval=PROBE_REFRESH_INTERVAL, concurrency=PROBE_CONCURRENCY, history=None):
+        self.timeout = timeout
+        self.history = history
+        self.refresh_interval = refresh_interval
+        self.concurrency = concurrency
+        self.lock = threading.Lock()
+        self.endpoints = {}  # server name -> (host, port)
+        self.cache = {}  # (host, port) -> latest ProbeResult
+        self.results = queue.Queue()
+        self.wake = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def set_servers(self, server_config_map):
+        """ Replaces the probed servers and triggers a refresh. Returns names with no host:port. """
+        endpoints, unparsed = {}, []
+        for name, server_data in server_config_map.items():
+            endpoint = parse_server_endpoint(server_data)
+            if endpoint is None:
+                unparsed.append(name)
+            else:
+                endpoints[name] = endpoint
+        with self.lock:
+            self.endpoints = endpoints
+        self.refresh()
+        return unparsed
+
+    def cached(self, name):
+        """ Latest result for a server, or None if it has not been probed yet """
+        with self.lock:
+            endpoint = self.endpoints.get(name)
+            return self.cache.get(endpoint) if endpoint else None
+
+    def refresh(self):
+        self.wake.set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake.set()
+
+    def poll(self):
+        """ {server name: ProbeResult} for every server probed since the last call """
+        updated = {}
+        while True:
+            try:
+                updated.update(self.results.get_nowait())
+            except queue.Empty:
+                return updated
+
+    def probe_round(self, loop, endpoints):
+        results = loop.run_until_complete(probe_endpoints(set(endpoints.values()), self.timeout, self.concurrency))
+        with self.lock:
+            self.cache.update(results)
+        if self.history:
+            for result in results.values():
+                self.history.record(result)
+            self.history.save()
+        self.results.put({name: results[endpoint] for name, endpoint in endpoints.items()})
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        try:
+            while not self.stop_event.is_set():
+                self.wake.clear()
+                with self.lock:
+                    endpoints = dict(self.endpoints)
+                if endpoints:
+                    try:
+                        self.probe_round(loop, endpoints)
+                    except Exception as e:
+                        # One bad round must not end the thread: the next refresh tries again
+                        print(f"Server probe round failed: {e!r}")
+                self.wake.wait(self.refresh_interval)
+        finally:
+            loop.close()
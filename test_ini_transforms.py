@@ -0,0 +1,56 @@
+import unittest
+from ini_document_module import IniDocument, run_transforms, set_keys, drop_sections, insert_into_section, replace_key_lines
+
+WORLDS_INI = ["[Gamma]\n", "multirun=0\n", "avatars=16\n", "upgradeServer=http://old.example.net\n", "\n",
+              "[InstalledWorlds]\n", "; installed\n", "\n",
+              "[a.example.net:6650]\n", "avatars=99\n", "\n",
+              "[Other]\n", "key=1\n"]
+
+def transformed(lines, *transforms):
+    return "".join(run_transforms(lines, transforms))
+
+class IniTransformTest(unittest.TestCase):
+    def test_set_keys_replaces_in_section_and_inserts_after_header(self):
+        document = IniDocument(list(WORLDS_INI))
+        result = transformed(document.lines, set_keys(document, {"avatars": "32", "classicchatbox": "1"}, "Gamma"))
+        self.assertIn("[Gamma]\nclassicchatbox=1\nmultirun=0\navatars=32\n", result)
+        self.assertIn("[a.example.net:6650]\navatars=99\n", result)
+
+    def test_set_keys_ignores_skipped_sections(self):
+        document = IniDocument(["[Gamma]\n", "multirun=0\n", "[a.example.net:6650]\n", "permitanyavatar=0\n"])
+        result = transformed(document.lines, set_keys(document, {"permitanyavatar": "1"}, "Gamma", skip_sections=["a.example.net:6650"]))
+        self.assertEqual(result, "[Gamma]\npermitanyavatar=1\nmultirun=0\n[a.example.net:6650]\npermitanyavatar=0\n")
+
+    def test_set_keys_creates_missing_section(self):
+        document = IniDocument(["[Other]\n", "key=1\n"])
+        self.assertEqual(transformed(document.lines, set_keys(document, {"x": "1"}, "Gamma")), "[Gamma]\nx=1\n[Other]\nkey=1\n")
+        self.assertEqual(transformed(document.lines, set_keys(document, {"x": "1"}, "Runtime", new_section_at_end=True)),
+                         "[Other]\nkey=1\n\n[Runtime]\nx=1\n")
+
+    def test_drop_sections(self):
+        result = transformed(WORLDS_INI, drop_sections({"a.example.net:6650"}))
+        self.assertNotIn("[a.example.net:6650]", result)
+        self.assertNotIn("avatars=99", result)
+        self.assertIn("[Other]\nkey=1\n", result)
+
+    def test_insert_into_section_is_idempotent_after_drop(self):
+        insert = insert_into_section("InstalledWorlds", ["\n", "[b.example.net:7000]\n"])
+        once = run_transforms(WORLDS_INI, [insert])
+        self.assertIn("; installed\n\n[b.example.net:7000]\n\n[a.example.net:6650]", "".join(once))
+        twice = run_transforms(once, [drop_sections({"b.example.net:7000"}), insert])
+        self.assertEqual(twice, once)
+
+    def test_insert_into_missing_section_appends(self):
+        result = transformed(["[Gamma]\n", "x=1\n", "\n", "\n"], insert_into_section("InstalledWorlds", ["[b:1]\n"]))
+        self.assertEqual(result, "[Gamma]\nx=1\n[b:1]\n")
+
+    def test_replace_key_lines(self):
+        result = transformed(WORLDS_INI, replace_key_lines({"upgradeserver": "upgradeServer=http://new.example.net\n",
+                                                            "scriptserver": "scriptServer=http://script.example.net\n"}))
+        self.assertIn("upgradeServer=http://new.example.net\n", result)
+        self.assertNotIn("old.example.net", result)
+        self.assertTrue(result.endswith("key=1\nscriptServer=http://script.example.net\n"))
+        self.assertNotIn("upgradeServer", transformed(WORLDS_INI, replace_key_lines({"upgradeserver": None})))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from server_config_module import ServerConfig
+from server_catalog_module import read_catalog, merge_catalog, ServerSearchIndex
+
+EXISTING = ServerConfig.parse({
+    "server_selection": {"LibreWorlds": {"address": "[test.libreworlds.org:32147]", "world_server": "WorldServer=worldserver://test.libreworlds.org:32147"}},
+    "updating_server": {"Nothing": {}, "Remove": {}}})
+
+def entry(name, address, **extra):
+    return {"name": name, "address": address, "world_server": f"worldserver://{address.strip('[]')}/", **extra}
+
+class MergeCatalogTest(unittest.TestCase):
+    def test_adds_renames_and_skips_duplicates(self):
+        config, result = merge_catalog(EXISTING, [
+            entry("Alpha", "alpha.example.net:6650", upgrade_server="upgradeServer=http://alpha.example.net/up"),
+            entry("LibreWorlds", "other.example.net:6650"),
+            entry("Copy", "[TEST.libreworlds.org:32147]"),
+            entry("Alpha again", "[alpha.example.net:6650]"),
+        ])
+        self.assertEqual(result.added, ["Alpha", "LibreWorlds (2)"])
+        self.assertEqual(result.renamed, [("LibreWorlds", "LibreWorlds (2)")])
+        self.assertEqual(result.duplicates, 2)
+        self.assertEqual(config.servers["Alpha"].address, "[alpha.example.net:6650]")
+        self.assertEqual(config.servers["Alpha"].world_server, "WorldServer=worldserver://alpha.example.net:6650/")
+        # Only entries with their own upgrade/script servers become updating servers
+        self.assertIn("Alpha", config.updating)
+        self.assertNotIn("LibreWorlds (2)", config.updating)
+        self.assertNotIn("Alpha", EXISTING.servers)
+
+    def test_invalid_entries_are_listed(self):
+        config, result = merge_catalog(EXISTING, [
+            entry("", "a.example.net:1"),
+            entry("Nothing", "b.example.net:1"),
+            {"name": "No address", "world_server": "x"},
+            entry("Bad host", "bad..host:6650"),
+            entry("Bad port", "c.example.net:70000"),
+            {"name": "Unreadable", "error": "its server entry is not an object."},
+        ])
+        self.assertEqual(result.added, [])
+        self.assertEqual([name for name, _ in result.invalid], ["?", "Nothing", "No address", "Bad host", "Bad port", "Unreadable"])
+        self.assertEqual(list(config.servers), ["LibreWorlds"])
+
+    def test_read_catalog_reports_non_object_entries(self):
+        directory = tempfile.mkdtemp(prefix="worlds_test_")
+        try:
+            path = os.path.join(directory, "catalog.json")
+            with open(path, 'w') as f:
+                json.dump({"server_selection": {"Good": {"address": "[g.example.net:1]", "world_server": "x"}, "Broken": 5,
+                                                "Odd": {"address": "[o.example.net:1]", "world_server": "x"}},
+                           "updating_server": {"Odd": "not an object"}}, f)
+            _, result = merge_catalog(EXISTING, read_catalog(path))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        self.assertEqual(result.added, ["Good"])
+        self.assertEqual([name for name, _ in result.invalid], ["Broken", "Odd"])
+
+class ServerSearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = ServerSearchIndex({
+            "Worlio": {"address": "[worlio.com:6650]"},
+            "LibreWorlds": {"address": "[test.libreworlds.org:32147]"},
+            "My Old World": {"address": "[old.example.net:6650]"},
+            "Official": {"address": "[test.3dcd.com:6650]"},
+        })
+
+    def test_empty_query_lists_everything_in_order(self):
+        self.assertEqual(self.index.search("  "), ["Worlio", "LibreWorlds", "My Old World", "Official"])
+
+    def test_prefix_matches_come_first(self):
+        # "wor" starts "Worlio" and "World"; it is only inside "LibreWorlds"
+        self.assertEqual(self.index.search("Wor"), ["Worlio", "My Old World", "LibreWorlds"])
+
+    def test_host_and_substring_matches(self):
+        self.assertEqual(self.index.search("test."), ["LibreWorlds", "Official"])
+        self.assertEqual(self.index.search("6650"), ["Worlio", "My Old World", "Official"])
+        self.assertEqual(self.index.search("3dcd"), ["Official"])
+        self.assertEqual(self.index.search("ld"), ["LibreWorlds", "My Old World"])
+        self.assertEqual(self.index.search("nowhere"), [])
+
+if __name__ == "__main__":
+    unittest.main()
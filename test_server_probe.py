@@ -0,0 +1,74 @@
+import time
+import socket
+import asyncio
+import unittest
+from unittest import mock
+import server_probe_module
+from server_probe_module import parse_server_endpoint, probe_endpoints, pick_fastest_server, ServerProber
+
+def closed_port():
+    """ A local port nothing listens on (bound, then released) """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class ServerProbeTest(unittest.TestCase):
+    def setUp(self):
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen()
+        self.open_port = self.listener.getsockname()[1]
+        self.closed_port = closed_port()
+
+    def tearDown(self):
+        self.listener.close()
+
+    def test_probe_open_and_closed_port(self):
+        results = asyncio.run(probe_endpoints({("127.0.0.1", self.open_port), ("127.0.0.1", self.closed_port)}, timeout=2.0))
+        self.assertTrue(results[("127.0.0.1", self.open_port)].reachable)
+        self.assertFalse(results[("127.0.0.1", self.closed_port)].reachable)
+
+    def test_bad_host_is_down_not_an_exception(self):
+        results = asyncio.run(probe_endpoints({("bad..host", 6650)}, timeout=2.0))
+        self.assertFalse(results[("bad..host", 6650)].reachable)
+
+    def test_pick_fastest_server_skips_closed_port(self):
+        servers = {"Closed": {"address": f"[127.0.0.1:{self.closed_port}]"},
+                   "Open": {"address": f"[127.0.0.1:{self.open_port}]"},
+                   "Broken": {"address": "[bad..host:6650]"}}
+        name, result = pick_fastest_server(servers, timeout=2.0)
+        self.assertEqual(name, "Open")
+        self.assertTrue(result.reachable)
+
+    def test_race_returns_by_its_deadline(self):
+        async def hanging_probe(host, port, timeout):
+            await asyncio.sleep(60)
+
+        servers = {f"Dead{i}": {"address": f"[dead{i}.example.net:6650]"} for i in range(500)}
+        with mock.patch.object(server_probe_module, "probe_endpoint", hanging_probe):
+            started_at = time.perf_counter()
+            self.assertIsNone(pick_fastest_server(servers, timeout=0.3))
+        self.assertLess(time.perf_counter() - started_at, 2.0)
+
+    def test_prober_survives_a_failing_round(self):
+        class FailingHistory:
+            def record(self, result):
+                raise RuntimeError("disk full")
+        prober = ServerProber(timeout=1.0, refresh_interval=0.05, history=FailingHistory())
+        prober.set_servers({"Open": {"address": f"[127.0.0.1:{self.open_port}]"}})
+        prober.start()
+        try:
+            time.sleep(0.5)
+            self.assertTrue(prober.thread.is_alive())
+        finally:
+            prober.stop()
+            prober.thread.join(2.0)
+
+    def test_parse_server_endpoint(self):
+        self.assertEqual(parse_server_endpoint({"address": "[Test.Example.net:6650]"}), ("test.example.net", 6650))
+        self.assertEqual(parse_server_endpoint({"address": "", "world_server": "WorldServer=worldserver://10.0.0.1:5670/"}), ("10.0.0.1", 5670))
+        for address in ("[bad..host:6650]", "[host:0]", "[host:70000]", f"[{'a' * 64}.net:6650]", "[no port]"):
+            self.assertIsNone(parse_server_endpoint({"address": address}), address)
+
+if __name__ == "__main__":
+    unittest.main()
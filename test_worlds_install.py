@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+import unittest
+from worlds_install_module import WorldsInstall, INI_FILE_NAME, OVERRIDE_FILE_NAME
+
+WORLDS_INI = ("[Gamma]\nmultirun=0\n\n[InstalledWorlds]\n; installed\n\n"
+              "[a.example.net:6650]\navatars=99\n\n[Other]\nkey=1\n")
+
+SERVERS = {"A": {"address": "[a.example.net:6650]", "world_server": "WorldServer=worldserver://a.example.net:6650/"},
+           "B": {"address": "[B.example.net:7000]", "world_server": "WorldServer=worldserver://b.example.net:7000/"}}
+
+class DetectCurrentServerTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp(prefix="worlds_test_")
+        self.install = WorldsInstall(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def write(self, name, text):
+        with open(os.path.join(self.path, name), 'w') as f:
+            f.write(text)
+        # Same-second rewrites of the same size must still be noticed
+        st = os.stat(os.path.join(self.path, name))
+        os.utime(os.path.join(self.path, name), ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def test_needs_section_and_world_server(self):
+        self.write(INI_FILE_NAME, WORLDS_INI)
+        self.write(OVERRIDE_FILE_NAME, "[Runtime]\nWorldServer=worldserver://a.example.net:6650/\n")
+        self.assertEqual(self.install.detect_current_server(SERVERS), "A")
+        self.write(OVERRIDE_FILE_NAME, "[Runtime]\nWorldServer=worldserver://b.example.net:7000/\n")
+        self.assertIsNone(self.install.detect_current_server(SERVERS))
+        self.write(INI_FILE_NAME, WORLDS_INI.replace("[a.example.net:6650]", "[b.example.net:7000]"))
+        self.assertEqual(self.install.detect_current_server(SERVERS), "B")
+
+    def test_missing_files(self):
+        self.assertIsNone(self.install.detect_current_server(SERVERS))
+
+if __name__ == "__main__":
+    unittest.main()
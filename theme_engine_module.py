@@ -0,0 +1,273 @@
+import os
+import json
+import shutil
+import hashlib
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ini_document_module import atomic_write_lines
+
+THEME_STATE_DIR = os.path.join("launcher_cache", "themes")
+MANIFEST_FILE_NAME = "theme_manifest.json"
+RESTORE_POINTS_DIR_NAME = "restore_points"
+RESTORE_POINT_FILE_NAME = "restore_point.json"
+RESTORE_POINT_LIMIT = 5
+HASH_CHUNK_SIZE = 1024 * 1024
+THEME_COPY_WORKERS = 4
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Case-folded directory listings: absolute path -> (mtime_ns, DirectoryIndex)
+_directory_index_cache = {}
+
+class DirectoryIndex:
+    """ One scan of a directory, answering case-insensitive name and extension-less stem lookups """
+
+    def __init__(self, directory, names):
+        self.directory = directory
+        self.names = {}
+        self.stems = {}
+        for name in names:
+            self.names.setdefault(name.casefold(), name)
+            self.stems.setdefault(os.path.splitext(name)[0].casefold(), name)
+
+    def resolve(self, filename):
+        """ Actual path of filename in this directory whatever its case, or None """
+        name = self.names.get(filename.casefold())
+        return os.path.join(self.directory, name) if name else None
+
+    def resolve_stem(self, stem):
+        """ Actual path of the first file named stem.<any extension>, or None """
+        name = self.stems.get(stem.casefold())
+        return os.path.join(self.directory, name) if name else None
+
+def directory_index(directory):
+    """ Cached DirectoryIndex of directory, rescanned only when the directory's mtime changes
+    (adding, removing or renaming an entry updates it). A missing directory gives an empty index. """
+    directory = os.path.abspath(directory)
+    try:
+        signature = os.stat(directory).st_mtime_ns
+    except OSError:
+        return DirectoryIndex(directory, [])
+    cached = _directory_index_cache.get(directory)
+    if cached and cached[0] == signature:
+        return cached[1]
+    with os.scandir(directory) as entries:
+        index = DirectoryIndex(directory, sorted(entry.name for entry in entries if entry.is_file()))
+    _directory_index_cache[directory] = (signature, index)
+    return index
+
+def read_files_list(files_list_path):
+    with open(files_list_path, 'r') as f:
+        # Read lines avoiding empty ones
+        return [line.strip() for line in f if line.strip()]
+
+class ThemePlan:
+    """ What applying a theme would do: files to copy as (filename, src, dst), and the ones skipped """
+
+    def __init__(self, theme):
+        self.theme = theme
+        self.to_copy = []
+        self.unchanged = []
+        self.missing = []
+
+class ThemeApplyResult:
+    def __init__(self, theme, copied=None, unchanged=None, missing=None, restore_point=None, failed=None, cancelled=False):
+        self.theme = theme
+        self.copied = copied or []
+        self.unchanged = unchanged or []
+        self.missing = missing or []
+        self.restore_point = restore_point
+        self.failed = failed or []  # (filename, error) pairs
+        self.cancelled = cancelled
+
+    def summary(self):
+        if self.cancelled:
+            msg = f"Applying theme '{self.theme}' cancelled.\n{len(self.copied)} files copied before cancelling."
+        else:
+            msg = f"Theme '{self.theme}' applied.\n{len(self.copied)} files copied, {len(self.unchanged)} already up to date."
+        if self.failed:
+            msg += f"\n{len(self.failed)} files could not be copied: " + ", ".join(name for name, _ in self.failed[:5])
+        if self.missing:
+            msg += f"\n\nMissing files in theme (skipped):\n" + "\n".join(self.missing[:5])
+            if len(self.missing) > 5:
+                msg += "\n..."
+        return msg
+
+class ThemeApplyEngine:
+    """ Applies themes by copying only the files whose content differs from what is installed.
+
+    A manifest remembers the size, mtime and SHA-1 of every file last installed (and of the theme
+    sources), so unchanged files are recognised from a stat() alone. Every apply snapshots the
+    files it is about to overwrite into a restore point, which revert() puts back. """
+
+    def __init__(self, themes_dir, target_dir, files_list_path, state_dir=None):
+        self.themes_dir = themes_dir
+        self.target_dir = target_dir
+        self.files_list_path = files_list_path
+        self.state_dir = state_dir or os.path.join(target_dir, THEME_STATE_DIR)
+        self.manifest_path = os.path.join(self.state_dir, MANIFEST_FILE_NAME)
+        self.restore_points_dir = os.path.join(self.state_dir, RESTORE_POINTS_DIR_NAME)
+        self.manifest = self.load_manifest()
+        self.manifest_lock = threading.Lock()
+
+    # --- Manifest ---
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault("current_theme", None)
+        manifest.setdefault("files", {})
+        manifest.setdefault("sources", {})
+        return manifest
+
+    def save_manifest(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        with self.manifest_lock:
+            text = json.dumps(self.manifest, indent=4)
+        atomic_write_lines(self.manifest_path, [text])
+
+    @property
+    def current_theme(self):
+        return self.manifest["current_theme"]
+
+    def known_hash(self, entries, key, path):
+        """ SHA-1 of path, reused from entries[key] while its size and mtime are unchanged """
+        st = os.stat(path)
+        with self.manifest_lock:
+            entry = entries.get(key)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha1"], st
+        sha1 = file_sha1(path)
+        with self.manifest_lock:
+            entries[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": sha1}
+        return sha1, st
+
+    # --- Apply ---
+    def plan(self, theme):
+        plan = ThemePlan(theme)
+        # Theme folders do not agree on case (BTopenworlds ships actb.gif, files.txt says Actb.gif)
+        theme_index = directory_index(os.path.join(self.themes_dir, theme))
+        for filename in read_files_list(self.files_list_path):
+            src_file = theme_index.resolve(filename)
+            # DESTINATION is the target path (where the exe is)
+            dst_file = os.path.join(self.target_dir, filename)
+            if src_file is None:
+                plan.missing.append(filename)
+                continue
+            if not os.path.isfile(dst_file):
+                plan.to_copy.append((filename, src_file, dst_file))
+                continue
+            src_hash, src_stat = self.known_hash(self.manifest["sources"], os.path.abspath(src_file), src_file)
+            if os.path.getsize(dst_file) != src_stat.st_size:
+                plan.to_copy.append((filename, src_file, dst_file))
+                continue
+            dst_hash, _ = self.known_hash(self.manifest["files"], filename, dst_file)
+            if dst_hash == src_hash:
+                plan.unchanged.append(filename)
+            else:
+                plan.to_copy.append((filename, src_file, dst_file))
+        return plan
+
+    def apply(self, theme, plan=None, progress=None, cancel_event=None, max_workers=THEME_COPY_WORKERS):
+        """ Copies the planned files through a bounded thread pool. progress(done, total, filename)
+        is called on the calling thread as each copy finishes; setting cancel_event skips every
+        file whose copy has not started yet. """
+        plan = plan or self.plan(theme)
+        restore_point = self.create_restore_point(plan) if plan.to_copy else None
+        result = ThemeApplyResult(theme, unchanged=plan.unchanged, missing=plan.missing, restore_point=restore_point)
+        total = len(plan.to_copy)
+        finished = False
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self.copy_file, filename, src_file, dst_file, cancel_event): filename
+                           for filename, src_file, dst_file in plan.to_copy}
+                for future in as_completed(futures):
+                    filename = futures[future]
+                    try:
+                        if not future.result():
+                            result.cancelled = True
+                            continue
+                    except OSError as e:
+                        result.failed.append((filename, e))
+                    else:
+                        result.copied.append(filename)
+                    if progress:
+                        progress(len(result.copied) + len(result.failed), total, filename)
+            finished = True
+        finally:
+            # A cancelled or partly failed apply leaves a mix of themes: it is not the current one
+            if finished and not result.cancelled and not result.failed:
+                self.manifest["current_theme"] = theme
+            self.save_manifest()
+        return result
+
+    def copy_file(self, filename, src_file, dst_file, cancel_event=None):
+        """ Returns False without copying if cancel_event is already set """
+        if cancel_event is not None and cancel_event.is_set():
+            return False
+        shutil.copy2(src_file, dst_file)
+        src_hash, _ = self.known_hash(self.manifest["sources"], os.path.abspath(src_file), src_file)
+        st = os.stat(dst_file)
+        with self.manifest_lock:
+            self.manifest["files"][filename] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": src_hash}
+        return True
+
+    # --- Restore points ---
+    def restore_points(self):
+        """ Restore point directories, oldest first """
+        try:
+            names = sorted(os.listdir(self.restore_points_dir))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.restore_points_dir, n) for n in names
+                if os.path.isfile(os.path.join(self.restore_points_dir, n, RESTORE_POINT_FILE_NAME))]
+
+    def has_restore_point(self):
+        return bool(self.restore_points())
+
+    def create_restore_point(self, plan):
+        point_dir = os.path.join(self.restore_points_dir, f"{time.time_ns():020d}")
+        os.makedirs(point_dir)
+        files = {}
+        for filename, _, dst_file in plan.to_copy:
+            if os.path.isfile(dst_file):
+                shutil.copy2(dst_file, os.path.join(point_dir, filename))
+                files[filename] = "saved"
+            else:
+                files[filename] = "absent"
+        # The description is written last: a point without it is incomplete and ignored
+        atomic_write_lines(os.path.join(point_dir, RESTORE_POINT_FILE_NAME),
+                           [json.dumps({"previous_theme": self.current_theme, "applied_theme": plan.theme, "files": files}, indent=4)])
+        for old_point in self.restore_points()[:-RESTORE_POINT_LIMIT]:
+            shutil.rmtree(old_point, ignore_errors=True)
+        return point_dir
+
+    def revert(self):
+        """ Puts back the files overwritten by the most recent apply. Returns the restored
+        theme name (None if it was unknown). Raises LookupError if there is no restore point. """
+        points = self.restore_points()
+        if not points:
+            raise LookupError("There is no previous theme to revert to.")
+        point_dir = points[-1]
+        with open(os.path.join(point_dir, RESTORE_POINT_FILE_NAME), 'r') as f:
+            description = json.load(f)
+        for filename, state in description["files"].items():
+            dst_file = os.path.join(self.target_dir, filename)
+            if state == "saved":
+                shutil.copy2(os.path.join(point_dir, filename), dst_file)
+            elif os.path.isfile(dst_file):
+                os.remove(dst_file)
+            # Re-hashed lazily on the next plan()
+            self.manifest["files"].pop(filename, None)
+        self.manifest["current_theme"] = description["previous_theme"]
+        self.save_manifest()
+        shutil.rmtree(point_dir, ignore_errors=True)
+        return description["previous_theme"]
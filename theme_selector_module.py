@@ -1,10 +1,23 @@
 import os
 import sys
-import shutil
+import queue
+import threading
 import customtkinter as ctk
 from PIL import Image
+from theme_engine_module import ThemeApplyEngine, directory_index
+from asset_cache_module import AssetCache, ASSET_CACHE_DIR
+from virtual_list_module import VirtualRowList
+
+THUMBNAIL_SIZE = (240, 135)
+THUMBNAIL_POLL_MS = 30
+APPLY_POLL_MS = 50
+THEME_ROW_HEIGHT = 160  # 150px theme button + 5px padding above and below
+SELECTED_COLOR = ("gray75", "#2CC985")  # Green selection color
+
+class ThemeSelectorWindow(VirtualRowList, ctk.CTkToplevel):
+    row_height = THEME_ROW_HEIGHT
+    row_padding = 5
 
-class ThemeSelectorWindow(ctk.CTkToplevel):
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -40,8 +53,30 @@ class ThemeSelectorWindow(ctk.CTkToplevel):
         self.grab_set()
 
         self.selected_theme = None
-        self.theme_buttons = []
+        self.themes = []
+        self.filtered_themes = []
+        self.first_index = 0 # Index in filtered_themes of the top visible row
+        self.rows = [] # Recycled pool: only as many buttons as rows fit on screen
+        self.visible_rows = {} # theme -> button currently showing it
+        self.theme_screenshots = {} # theme -> screenshot path
         self.theme_images = {} # To keep references to images
+        self.placeholder_image = ctk.CTkImage(light_image=Image.new("RGBA", THUMBNAIL_SIZE, (0, 0, 0, 0)), size=THUMBNAIL_SIZE)
+
+        # Screenshots are requested for visible rows only, decoded on a worker thread
+        # and handed back to the Tk thread through thumbnail_queue
+        self.asset_cache = AssetCache(os.path.join(self.external_path, ASSET_CACHE_DIR))
+        self.thumbnail_requests = queue.Queue()
+        self.thumbnail_queue = queue.Queue()
+        self.thumbnail_stop = threading.Event()
+        self.requested_thumbnails = set()
+        self.pending_thumbnails = 0
+        threading.Thread(target=self.decode_thumbnails, daemon=True).start()
+
+        self.theme_engine = ThemeApplyEngine(self.themes_dir, self.external_path, self.files_list_path)
+        # Theme copies run on a worker thread that reports through this queue
+        self.apply_events = queue.Queue()
+        self.apply_cancel = threading.Event()
+        self.applying = False
 
         self.create_widgets()
         self.load_themes()
@@ -51,20 +86,68 @@ class ThemeSelectorWindow(ctk.CTkToplevel):
         self.label_title = ctk.CTkLabel(self, text="Select a Theme", font=("Roboto", 24))
         self.label_title.pack(pady=20)
 
-        # Theme List Container (Scrollable)
-        self.scrollable_frame = ctk.CTkScrollableFrame(self, label_text="Available Themes")
-        self.scrollable_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        # Name Filter
+        self.entry_filter = ctk.CTkEntry(self, placeholder_text="Filter themes by name...")
+        self.entry_filter.pack(fill="x", padx=20)
+        self.entry_filter.bind("<KeyRelease>", lambda event: self.apply_filter())
+
+        # Theme List Container (virtualized: rows are recycled while scrolling)
+        self.list_frame = ctk.CTkFrame(self)
+        self.list_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        self.scrollbar = ctk.CTkScrollbar(self.list_frame, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.rows_frame = ctk.CTkFrame(self.list_frame, fg_color="transparent")
+        self.rows_frame.pack(side="left", fill="both", expand=True)
+        self.rows_frame.bind("<Configure>", self.on_list_resize)
+
+        # Mouse wheel anywhere in the window scrolls the list (Windows/macOS and X11 events)
+        self.bind("<MouseWheel>", lambda event: self.scroll_rows(-1 if event.delta > 0 else 1))
+        self.bind("<Button-4>", lambda event: self.scroll_rows(-1))
+        self.bind("<Button-5>", lambda event: self.scroll_rows(1))
+
+        # Apply / Revert Buttons
+        self.buttons_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.buttons_frame.pack(pady=20)
 
-        # Apply Button
         self.btn_apply = ctk.CTkButton(
-            self, 
+            self.buttons_frame, 
             text="Apply Theme", 
             command=self.apply_theme, 
             state="disabled",
             height=40,
             font=("Roboto", 16)
         )
-        self.btn_apply.pack(pady=20)
+        self.btn_apply.pack(side="left", padx=10)
+
+        self.btn_revert = ctk.CTkButton(
+            self.buttons_frame, 
+            text="Revert to Previous Theme", 
+            command=self.revert_theme, 
+            state="normal" if self.theme_engine.has_restore_point() else "disabled",
+            fg_color="transparent",
+            border_width=1,
+            height=40,
+            font=("Roboto", 16)
+        )
+        self.btn_revert.pack(side="left", padx=10)
+
+        self.btn_cancel = ctk.CTkButton(
+            self.buttons_frame, 
+            text="Cancel", 
+            command=self.apply_cancel.set, 
+            state="disabled",
+            fg_color="transparent",
+            border_width=1,
+            height=40,
+            width=90,
+            font=("Roboto", 16)
+        )
+        self.btn_cancel.pack(side="left", padx=10)
+
+        # Copy Progress
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x", padx=20)
 
         # Status Label
         self.label_status = ctk.CTkLabel(self, text="", text_color="gray")
@@ -82,12 +165,8 @@ class ThemeSelectorWindow(ctk.CTkToplevel):
             self.label_status.configure(text=f"Error reading themes: {e}", text_color="red")
             return
 
-        # Pre-load available screenshots map (lowercased without extension -> full filename)
-        screenshot_map = {}
-        if os.path.exists(self.screenshots_dir):
-            for f in os.listdir(self.screenshots_dir):
-                name, ext = os.path.splitext(f)
-                screenshot_map[name.lower()] = f
+        # Case-insensitive index of available screenshots (also matches by name without extension)
+        screenshot_index = directory_index(self.screenshots_dir)
 
         # Custom mappings (lowercase theme name -> filename)
         custom_map = {
@@ -97,97 +176,175 @@ class ThemeSelectorWindow(ctk.CTkToplevel):
         }
 
         for theme in themes:
-            # Check for image
-            theme_img = None
             theme_key = theme.lower()
-            
-            img_filename = None
-            
+
             # Check custom map first, then automatic map
             if theme_key in custom_map:
-                img_filename = custom_map[theme_key]
-            elif theme_key in screenshot_map:
-                img_filename = screenshot_map[theme_key]
-
-            if img_filename:
-                img_path = os.path.join(self.screenshots_dir, img_filename)
-                try:
-                    # Load and resize image for icon
-                    pil_img = Image.open(img_path)
-                    theme_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=(240, 135))
-                    # Keep reference
-                    self.theme_images[theme] = theme_img
-                except Exception as e:
-                    print(f"Error loading image for {theme}: {e}")
-
-            # Create a button for each theme
-            btn = ctk.CTkButton(
-                self.scrollable_frame, 
-                text=theme, 
-                fg_color="transparent", 
-                border_width=1, 
-                border_color=("gray70", "gray30"),
-                text_color=("gray10", "#DCE4EE"),
-                anchor="w",
-                image=theme_img,
-                compound="left",
-                height=150,
-                font=("Roboto", 24),
-                command=lambda t=theme: self.select_theme(t)
-            )
-            btn.pack(fill="x", pady=5, padx=5)
-            self.theme_buttons.append(btn)
+                img_path = screenshot_index.resolve(custom_map[theme_key])
+            else:
+                img_path = screenshot_index.resolve_stem(theme)
+
+            if img_path:
+                self.theme_screenshots[theme] = img_path
+
+        self.themes = themes
+        self.apply_filter()
+
+    def apply_filter(self):
+        needle = self.entry_filter.get().strip().lower()
+        self.filtered_themes = [t for t in self.themes if needle in t.lower()] if needle else list(self.themes)
+        self.first_index = 0
+        self.render_rows()
+
+    def row_items(self):
+        return self.filtered_themes
+
+    def create_row(self):
+        return ctk.CTkButton(
+            self.rows_frame, 
+            text="", 
+            fg_color="transparent", 
+            border_width=1, 
+            border_color=("gray70", "gray30"),
+            text_color=("gray10", "#DCE4EE"),
+            anchor="w",
+            image=self.placeholder_image,
+            compound="left",
+            height=150,
+            font=("Roboto", 24)
+        )
+
+    def show_row(self, btn, theme):
+        btn.configure(
+            text=theme,
+            image=self.theme_images.get(theme, self.placeholder_image),
+            fg_color=SELECTED_COLOR if theme == self.selected_theme else "transparent",
+            command=lambda t=theme: self.select_theme(t)
+        )
+        self.request_thumbnail(theme)
+
+    def request_thumbnail(self, theme):
+        if theme in self.theme_images or theme in self.requested_thumbnails or theme not in self.theme_screenshots:
+            return
+        self.requested_thumbnails.add(theme)
+        self.thumbnail_requests.put((theme, self.theme_screenshots[theme]))
+        self.pending_thumbnails += 1
+        if self.pending_thumbnails == 1:
+            self.after(THUMBNAIL_POLL_MS, self.poll_thumbnails)
+
+    def decode_thumbnails(self):
+        # Worker thread: never touches Tk, only the queues
+        while not self.thumbnail_stop.is_set():
+            try:
+                theme, img_path = self.thumbnail_requests.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self.thumbnail_queue.put((theme, self.asset_cache.get(img_path, THUMBNAIL_SIZE), None))
+            except Exception as e:
+                self.thumbnail_queue.put((theme, None, e))
+
+    def poll_thumbnails(self):
+        if self.thumbnail_stop.is_set():
+            return
+        while self.pending_thumbnails:
+            try:
+                theme, pil_img, error = self.thumbnail_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_thumbnails -= 1
+            if error is not None:
+                print(f"Error loading image for {theme}: {error}")
+                continue
+            theme_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=THUMBNAIL_SIZE)
+            # Keep reference
+            self.theme_images[theme] = theme_img
+            if theme in self.visible_rows:
+                self.visible_rows[theme].configure(image=theme_img)
+        if self.pending_thumbnails:
+            self.after(THUMBNAIL_POLL_MS, self.poll_thumbnails)
+
+    def destroy(self):
+        self.thumbnail_stop.set()
+        self.apply_cancel.set()
+        super().destroy()
 
     def select_theme(self, theme_name):
         self.selected_theme = theme_name
         self.label_title.configure(text=f"Selected: {theme_name}")
-        self.btn_apply.configure(state="normal")
+        if not self.applying:
+            self.btn_apply.configure(state="normal")
         
         # Update visual selection
-        for btn in self.theme_buttons:
-            if btn.cget("text") == theme_name:
-                btn.configure(fg_color=("gray75", "#2CC985")) # Green selection color
-            else:
-                btn.configure(fg_color="transparent")
+        self.render_rows()
 
     def apply_theme(self):
-        if not self.selected_theme:
+        if not self.selected_theme or self.applying:
             return
 
         if not os.path.exists(self.files_list_path):
             self.label_status.configure(text="Error: files.txt not found", text_color="red")
             return
 
-        theme_path = os.path.join(self.themes_dir, self.selected_theme)
-        
+        self.applying = True
+        self.apply_cancel.clear()
+        self.btn_apply.configure(state="disabled")
+        self.btn_revert.configure(state="disabled")
+        self.btn_cancel.configure(state="normal")
+        self.progress_bar.set(0)
+        self.label_status.configure(text=f"Checking '{self.selected_theme}'...", text_color="gray")
+        threading.Thread(target=self.run_apply, args=(self.selected_theme,), daemon=True).start()
+        self.after(APPLY_POLL_MS, self.poll_apply)
+
+    def run_apply(self, theme):
+        # Worker thread: never touches Tk, only the queue
         try:
-            with open(self.files_list_path, 'r') as f:
-                # Read lines avoiding empty ones
-                files_to_copy = [line.strip() for line in f if line.strip()]
-
-            count = 0
-            missing_files = []
-
-            for filename in files_to_copy:
-                src_file = os.path.join(theme_path, filename)
-                # DESTINATION is the external path (where the exe is)
-                dst_file = os.path.join(self.external_path, filename)
-
-                if os.path.exists(src_file):
-                    shutil.copy2(src_file, dst_file)
-                    count += 1
-                else:
-                    missing_files.append(filename)
-
-            msg = f"Theme '{self.selected_theme}' applied.\n{count} files copied."
-            if missing_files:
-                msg += f"\n\nMissing files in theme (skipped):\n" + "\n".join(missing_files[:5])
-                if len(missing_files) > 5:
-                    msg += "\n..."
-            
-            self.label_status.configure(text="Theme applied successfully!", text_color="green")
-            # We can also close the window or stay open
-            # self.destroy() 
+            # Only files whose content differs from the installed ones are copied
+            result = self.theme_engine.apply(
+                theme,
+                progress=lambda done, total, filename: self.apply_events.put(("progress", (done, total, filename))),
+                cancel_event=self.apply_cancel
+            )
+            self.apply_events.put(("done", result))
+        except Exception as e:
+            self.apply_events.put(("error", e))
 
+    def poll_apply(self):
+        if not self.winfo_exists():
+            return
+        while True:
+            try:
+                kind, payload = self.apply_events.get_nowait()
+            except queue.Empty:
+                self.after(APPLY_POLL_MS, self.poll_apply)
+                return
+            if kind == "progress":
+                done, total, filename = payload
+                self.progress_bar.set(done / total)
+                self.label_status.configure(text=f"Copying {filename} ({done}/{total})", text_color="gray")
+                continue
+            if kind == "done":
+                self.progress_bar.set(1)
+                color = "orange" if payload.cancelled or payload.failed or payload.missing else "green"
+                self.label_status.configure(text=payload.summary(), text_color=color)
+            else:
+                self.label_status.configure(text=f"Error: {str(payload)}", text_color="red")
+            self.finish_apply()
+            return
+
+    def finish_apply(self):
+        self.applying = False
+        self.btn_apply.configure(state="normal" if self.selected_theme else "disabled")
+        self.btn_revert.configure(state="normal" if self.theme_engine.has_restore_point() else "disabled")
+        self.btn_cancel.configure(state="disabled")
+
+    def revert_theme(self):
+        if self.applying:
+            return
+        try:
+            previous_theme = self.theme_engine.revert()
+            name = f"'{previous_theme}'" if previous_theme else "the previous files"
+            self.label_status.configure(text=f"Reverted to {name}.", text_color="green")
         except Exception as e:
             self.label_status.configure(text=f"Error: {str(e)}", text_color="red")
+        self.btn_revert.configure(state="normal" if self.theme_engine.has_restore_point() else "disabled")
@@ -0,0 +1,82 @@
+import customtkinter as ctk
+
+class VirtualRowList:
+    """ Mixin for a virtualized list: only as many row widgets as fit on screen exist, placed in
+    rows_frame and recycled while scrolling, so the list costs the same with thousands of items.
+
+    The widget using it sets row_height and row_padding (in unscaled pixels), creates rows_frame
+    (binding its <Configure> to on_list_resize) and scrollbar (command=on_scrollbar), initializes
+    rows = [], visible_rows = {} and first_index = 0, and implements row_items(), create_row()
+    and show_row(). visible_rows maps every item on screen to the row showing it. """
+
+    row_height = 32
+    row_padding = 3
+
+    # --- Hooks ---
+    def row_items(self):
+        """ Every item of the list, in display order """
+        raise NotImplementedError
+
+    def create_row(self):
+        """ A new row for the pool (not placed yet) """
+        raise NotImplementedError
+
+    def show_row(self, row, item):
+        """ Makes row display item """
+        raise NotImplementedError
+
+    def row_widget(self, row):
+        """ The widget placed for row (rows that are a tuple of widgets override this) """
+        return row
+
+    # --- Layout ---
+    def list_height(self, height=None):
+        # winfo/event heights are physical pixels; place() coordinates are scaled by CustomTkinter
+        height = self.rows_frame.winfo_height() if height is None else height
+        return height / ctk.ScalingTracker.get_widget_scaling(self)
+
+    def visible_row_count(self):
+        return max(1, int(self.list_height() // self.row_height))
+
+    def on_list_resize(self, event):
+        # One extra row covers the partially visible one at the bottom
+        needed = int(self.list_height(event.height) // self.row_height) + 1
+        while len(self.rows) < needed:
+            self.rows.append(self.create_row())
+        while len(self.rows) > needed:
+            self.row_widget(self.rows.pop()).destroy()
+        self.render_rows()
+
+    def render_rows(self):
+        items = self.row_items()
+        last_start = max(0, len(items) - self.visible_row_count())
+        self.first_index = min(max(0, self.first_index), last_start)
+        self.visible_rows = {}
+
+        for i, row in enumerate(self.rows):
+            index = self.first_index + i
+            if index >= len(items):
+                self.row_widget(row).place_forget()
+                continue
+            self.show_row(row, items[index])
+            self.row_widget(row).place(x=0, y=i * self.row_height + self.row_padding, relwidth=1)
+            self.visible_rows[items[index]] = row
+
+        total = len(items)
+        if total:
+            self.scrollbar.set(self.first_index / total, min(1.0, (self.first_index + self.visible_row_count()) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # --- Scrolling ---
+    def scroll_rows(self, delta):
+        self.first_index += delta
+        self.render_rows()
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.first_index = int(round(float(value) * len(self.row_items())))
+            self.render_rows()
+        elif action == "scroll":
+            step = self.visible_row_count() if unit == "pages" else 1
+            self.scroll_rows(int(value) * step)
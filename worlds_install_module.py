@@ -0,0 +1,254 @@
+import os
+import sys
+from ini_document_module import (IniDocument, IniTransaction, load_ini_document, save_ini_document, run_transforms,
+                                 set_keys, drop_sections, insert_into_section, replace_key_lines)
+
+INI_FILE_NAME = 'worlds.ini'
+OVERRIDE_FILE_NAME = 'override.ini'
+EXECUTABLE_NAME = 'run.exe'
+FALLBACK_EXECUTABLE_NAME = 'WorldsPlayer.exe'
+SERVER_CONFIG_FILE = 'worldsserverselection.json'
+PROFILES_FILE = 'worldsprofiles.json'
+DEFAULT_AVATARS = 16
+MAX_AVATARS = 256  # Highest avatars= value the client accepts
+
+DEFAULT_SERVER_CONFIG = {"server_selection": {"LibreWorlds": {"address": "[test.libreworlds.org:32147]","world_server": "WorldServer=worldserver://test.libreworlds.org:32147"},"Official": {"address": "[test.3dcd.com:6650]","world_server": "WorldServer=worldserver://http://us1.worlds.net/3DCDup"},"Worlio": {"address": "[worlio.com:6650]","world_server": "WorldServer=worldserver://worlio.com:6650/"}},"updating_server": {"Nothing": {},"Remove": {},"LibreWorlds": {"upgrade_server": "upgradeServer=http://upgrade.libreworlds.org/3DCDup","script_server": "scriptServer=http://script.libreworlds.org"},"Official": {"upgrade_server": "upgradeServer=http://us1.worlds.net/3DCDup","script_server": None},"Worlio": {"upgrade_server": "UpgradeServer=http://files.worlio.com/DCDup/","script_server": "ScriptServer=http://files.worlio.com/cgi-bin/"},"Jett": {"upgrade_server": "upgradeServer=http://jett.dacii.net/3DCDup/","script_server": "ScriptServer=http://jett.dacii.net/cgi-bin/"}}}
+
+def bundle_dir():
+    """ Where the bundled themes and files.txt are: inside the PyInstaller bundle when frozen """
+    return getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+
+def bundled_theme_paths():
+    """ (themes directory, files.txt) shipped with the launcher """
+    return os.path.join(bundle_dir(), "themes"), os.path.join(bundle_dir(), "files.txt")
+
+def _section_name(address_line):
+    """ "[host:port]" -> "host:port", lowercased like the IniDocument section index """
+    clean_line = (address_line or "").strip()
+    if clean_line.startswith('[') and clean_line.endswith(']'):
+        clean_line = clean_line[1:-1]
+    return clean_line.strip().lower()
+
+def _world_server_value(world_server_line):
+    """ The value of a "WorldServer=..." line, lowercased for comparison """
+    return (world_server_line or "").partition('=')[2].strip().lower()
+
+class ServerIndex:
+    """ The server list keyed the way detection looks it up: WorldServer value -> names and
+    name -> [host:port] section, so detecting the current server costs the same for 3 servers or 3000. """
+
+    _cache = (None, None, None)  # (server_config_map, its length, index) of the last lookup
+
+    def __init__(self, server_config_map):
+        self.by_world_server = {}  # WorldServer value -> server names, in list order
+        self.sections = {}  # server name -> lower section name of its address line
+        for name, server_data in server_config_map.items():
+            if "address" not in server_data or "world_server" not in server_data:
+                continue
+            self.by_world_server.setdefault(_world_server_value(server_data["world_server"]), []).append(name)
+            self.sections[name] = _section_name(server_data["address"])
+
+    @classmethod
+    def of(cls, server_config_map):
+        """ Index of server_config_map, rebuilt only when a different (or resized) map is passed """
+        config_map, size, index = cls._cache
+        if config_map is not server_config_map or size != len(server_config_map):
+            index = cls(server_config_map)
+            cls._cache = (server_config_map, len(server_config_map), index)
+        return index
+
+class LauncherError(Exception):
+    """ An expected failure, with a short title: the GUI shows it in a message box, the CLI prints it """
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+
+class WorldsInstall:
+    """ The ini files, server list and executables of one game folder. Everything here is
+    UI-free, so the GUI, the command line and batch tools share the same logic. """
+
+    def __init__(self, path):
+        self.path = path
+        self.worlds_path = os.path.join(path, INI_FILE_NAME)
+        self.override_path = os.path.join(path, OVERRIDE_FILE_NAME)
+        self.server_config_path = os.path.join(path, SERVER_CONFIG_FILE)
+        self.profiles_path = os.path.join(path, PROFILES_FILE)
+        self._server_config = None
+        self._detected = (None, None)  # ((worlds.ini document, override.ini document, ServerIndex), server name)
+
+    def has_ini_files(self):
+        return os.path.isfile(self.worlds_path) and os.path.isfile(self.override_path)
+
+    def require_ini_files(self):
+        if not self.has_ini_files():
+            raise LauncherError("File Not Found", f"Could not find '{INI_FILE_NAME}' or '{OVERRIDE_FILE_NAME}'. They must be in the same folder as the launcher.")
+
+    # --- worlds.ini settings ---
+    def transaction(self):
+        return IniTransaction(self.worlds_path)
+
+    def setting_status(self, setting_name, default_active=False, transaction=None):
+        value = transaction.get(setting_name) if transaction is not None else None
+        if value is None:
+            try:
+                value = load_ini_document(self.worlds_path).get(setting_name)
+            except FileNotFoundError:
+                return default_active
+        if value is None:
+            return default_active
+        if setting_name.lower() == 'disableshaper':
+            return value == "0"
+        return value == "1"
+
+    def toggled_value(self, setting_name, default_active=False, transaction=None):
+        """ The value that flips setting_name's current status (disableshaper is stored inverted) """
+        is_active = self.setting_status(setting_name, default_active, transaction)
+        if setting_name.lower() == 'disableshaper':
+            return "1" if is_active else "0"
+        return "0" if is_active else "1"
+
+    def avatars(self):
+        try:
+            value = load_ini_document(self.worlds_path).get("avatars")
+            return DEFAULT_AVATARS if value is None else int(value)
+        except (FileNotFoundError, ValueError):
+            return DEFAULT_AVATARS
+
+    def commit(self, transaction):
+        """ Writes transaction to worlds.ini. Returns True if the file changed. Staged changes are
+        dropped on failure, which raises LauncherError. """
+        try:
+            return transaction.commit()
+        except FileNotFoundError:
+            transaction.discard()
+            raise LauncherError("File Not Found", f"'{INI_FILE_NAME}' could not be found.")
+        except OSError as e:
+            transaction.discard()
+            raise LauncherError("Error", f"An error occurred while modifying worlds.ini:\n{e}")
+
+    # --- Server list ---
+    @property
+    def server_config(self):
+        """ ServerConfigStore of this install's server list, created on first use """
+        if self._server_config is None:
+            from server_config_module import ServerConfigStore  # it imports this module
+            self._server_config = ServerConfigStore(self.server_config_path)
+        return self._server_config
+
+    def load_server_config(self):
+        """ The validated server list as {"server_selection": ..., "updating_server": ...}, creating the
+        default one first if it does not exist. Re-read only when the file changed; do not modify it. """
+        return self.server_config.load().as_dict()
+
+    def _world_server_candidates(self, index):
+        """ Names of the servers whose WorldServer value is the one in override.ini's [Runtime] section """
+        try:
+            override_document = load_ini_document(self.override_path)
+        except FileNotFoundError:
+            return None, []
+        value = override_document.get("worldserver", "Runtime")
+        if value is None:
+            return override_document, []
+        return override_document, index.by_world_server.get(value.strip().lower(), [])
+
+    def detect_current_server(self, configurations):
+        """ Name of the first server whose [host:port] section is in worlds.ini and whose WorldServer
+        value is override.ini's, or None. Re-evaluated only when either file or the server list changed. """
+        index = ServerIndex.of(configurations)
+        try:
+            worlds_document = load_ini_document(self.worlds_path)
+        except FileNotFoundError:
+            return None
+        override_document, candidates = self._world_server_candidates(index)
+        if override_document is None:
+            return None
+        # load_ini_document hands back the same objects while the files' mtime and size are unchanged
+        key, result = self._detected
+        if key is not None and key[0] is worlds_document and key[1] is override_document and key[2] is index:
+            return result
+        result = next((name for name in candidates if worlds_document.has_section(index.sections[name])), None)
+        self._detected = ((worlds_document, override_document, index), result)
+        return result
+
+    def detect_world_server(self, configurations):
+        """ Name of the server whose WorldServer line is in override.ini, ignoring worlds.ini
+        (newer clients keep no [host:port] section there), or None """
+        _, candidates = self._world_server_candidates(ServerIndex.of(configurations))
+        return candidates[0] if candidates else None
+
+    def detect_updating_server(self, updating_config_map):
+        """ Name of the updating server whose upgradeServer line is in worlds.ini, "Remove" if there is
+        none, or "Nothing" if the line matches no configured entry """
+        try:
+            document = load_ini_document(self.worlds_path)
+        except FileNotFoundError:
+            return "Nothing"
+        index = document.find("upgradeserver")
+        if index == -1:
+            return "Remove" if document.find("scriptserver") == -1 else "Nothing"
+        current_line = document.lines[index].strip().lower()
+        for name, config in updating_config_map.items():
+            if (config.get("upgrade_server") or "").strip().lower() == current_line:
+                return name
+        return "Nothing"
+
+    def apply_server_changes(self, server_option, updating_option, server_config_map, updating_config_map, settings=None):
+        """ Rewrites override.ini and worlds.ini for the selected server and updating server.
+        settings ({key: value} for [Gamma]) are folded into the same worlds.ini write.
+        Each file is rewritten in one pass and atomically replaced, and only if its content changes.
+        Returns True if either was written. """
+        if server_option not in server_config_map:
+            raise LauncherError("Unknown Server", f"'{server_option}' is not in the server list.")
+        if updating_option and updating_option not in ("Nothing", "Remove") and updating_option not in updating_config_map:
+            raise LauncherError("Unknown Server", f"'{updating_option}' is not in the updating server list.")
+        selected_server_config = server_config_map[server_option]
+        world_server_key, _, world_server_value = selected_server_config["world_server"].strip().partition('=')
+
+        override_document = load_ini_document(self.override_path)
+        written = self._rewrite(override_document, [
+            set_keys(override_document, {world_server_key: world_server_value}, "Runtime", new_section_at_end=True),
+        ])
+
+        worlds_document = load_ini_document(self.worlds_path)
+        server_sections = {_section_name(config["address"]) for config in server_config_map.values()}
+        transforms = []
+        if settings:
+            transforms.append(set_keys(worlds_document, settings, "Gamma", skip_sections=server_sections))
+        transforms.append(drop_sections(server_sections))
+        if os.path.isfile(os.path.join(self.path, EXECUTABLE_NAME)):
+            # Only the old client (run.exe) lists the server as a section of worlds.ini
+            transforms.append(insert_into_section("InstalledWorlds", ['\n', selected_server_config["address"] + '\n']))
+        if updating_option == "Remove":
+            transforms.append(replace_key_lines({"upgradeserver": None, "scriptserver": None}))
+        elif updating_option and updating_option != "Nothing":
+            selected_updating_config = updating_config_map[updating_option]
+            transforms.append(replace_key_lines({
+                key: (line + '\n' if line else None)
+                for key, line in (("upgradeserver", selected_updating_config.get("upgrade_server")),
+                                  ("scriptserver", selected_updating_config.get("script_server")))}))
+        return self._rewrite(worlds_document, transforms) or written
+
+    def _rewrite(self, document, transforms):
+        """ Runs transforms over document's lines and atomically replaces its file if the result differs """
+        new_lines = run_transforms(document.lines, transforms)
+        if "".join(new_lines) == "".join(document.lines):
+            return False
+        save_ini_document(IniDocument(new_lines), document.path)
+        return True
+
+    # --- Executable ---
+    def find_executable(self):
+        run_exe_path = os.path.join(self.path, EXECUTABLE_NAME)
+        worldsplayer_exe_path = os.path.join(self.path, FALLBACK_EXECUTABLE_NAME)
+        if os.path.isfile(run_exe_path):
+            return run_exe_path
+        if os.path.isfile(worldsplayer_exe_path):
+            return worldsplayer_exe_path
+        return None
+
+    def require_executable(self):
+        executable_path = self.find_executable()
+        if not executable_path:
+            raise LauncherError("Executable Not Found", f"Could not find '{EXECUTABLE_NAME}' or '{FALLBACK_EXECUTABLE_NAME}'.\nPlease ensure one of them is in the program folder.")
+        return executable_path